@@ -8,7 +8,6 @@ with environment variables and settings files so users can script workflows
 confidently.
 """
 
-import csv
 import importlib.metadata
 import json
 import os
@@ -29,9 +28,15 @@ from .settings import MeasureSettings
 
 LATENCY_CSV_FILE = "latency.csv"
 LATENCY_CSV_HEADERS = ["latency_ms"]
+LATENCY_NPY_FILE = "latency.npy"
 
 TIMES_CSV_FILE = "times.csv"
 TIMES_CSV_HEADERS = ["src_time", "recv_time"]
+TIMES_NPY_FILE = "times.npy"
+
+SUMMARY_JSON_FILE = "summary.json"
+
+CSV_WRITE_BUFFER_BYTES = 1 << 16
 
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 
@@ -90,7 +95,7 @@ def measure(
         ),
     ] = None,
 ):
-    """Collect samples from an LSL stream and write JSON/CSV artifacts.
+    """Collect samples from an LSL stream and write JSON/CSV/NPY artifacts.
 
     Args:
         stream_key: Optional LSL resolve key (for example ``"type"``).
@@ -145,6 +150,9 @@ def measure(
     except RuntimeError as e:
         print(f"[yellow]Warning:[/] Resource monitoring is disabled ({e})")
         resource_monitor = None
+    else:
+        # Sample on a background thread so psutil calls stay off the drain loop.
+        resource_monitor.start()
 
     end_time = time.time() + settings.duration_seconds
     collected_samples: list[tuple] = []
@@ -152,8 +160,6 @@ def measure(
     try:
         # Collect in small increments to avoid blocking and stay responsive.
         while time.time() < end_time:
-            if resource_monitor is not None:
-                resource_monitor.maybe_sample()
             collected_samples.extend(inlet_worker.ring.drain_upto(16))
             time.sleep(0.01)
         # After the main collection, drain any remaining samples from the buffer.
@@ -163,18 +169,28 @@ def measure(
         if resource_monitor is not None:
             resource_monitor.finalize()
 
-    # Use 'with' to manage both file handles safely
+    latency_blocks: list[np.ndarray] = []
+    times_blocks: list[np.ndarray] = []
+
+    # Every field is a bare float, so rows are formatted directly rather than
+    # through csv.writer; repr() round-trips each value exactly.
     with (
-        open(output_directory / LATENCY_CSV_FILE, "w", newline="") as latency_file,
-        open(output_directory / TIMES_CSV_FILE, "w", newline="") as times_file,
+        open(
+            output_directory / LATENCY_CSV_FILE,
+            "w",
+            encoding="utf-8",
+            buffering=CSV_WRITE_BUFFER_BYTES,
+        ) as latency_file,
+        open(
+            output_directory / TIMES_CSV_FILE,
+            "w",
+            encoding="utf-8",
+            buffering=CSV_WRITE_BUFFER_BYTES,
+        ) as times_file,
     ):
-        # Create CSV writers for both files
-        latency_writer = csv.writer(latency_file)
-        times_writer = csv.writer(times_file)
-
         # Write headers
-        latency_writer.writerow(LATENCY_CSV_HEADERS)
-        times_writer.writerow(TIMES_CSV_HEADERS)
+        latency_file.write(",".join(LATENCY_CSV_HEADERS) + "\n")
+        times_file.write(",".join(TIMES_CSV_HEADERS) + "\n")
 
         # Process each chunk of collected samples
         for _data, src_timestamp_list, receive_timestamp in collected_samples:
@@ -187,13 +203,28 @@ def measure(
                 source_timestamps, float(receive_timestamp)
             )
             latencies_ms = (recv_timestamps - source_timestamps) * 1000.0
+            latency_blocks.append(latencies_ms)
+            times_blocks.append(np.column_stack((source_timestamps, recv_timestamps)))
+
+            # Write the per-sample timing information to disk, one chunk at a time.
+            latency_file.writelines(f"{value!r}\n" for value in latencies_ms.tolist())
+            times_file.writelines(
+                f"{src_ts!r},{recv_ts!r}\n"
+                for src_ts, recv_ts in zip(
+                    source_timestamps.tolist(), recv_timestamps.tolist(), strict=True
+                )
+            )
 
-            # Write the per-sample timing information to disk.
-            for src_ts, recv_ts, latency_ms in zip(
-                source_timestamps, recv_timestamps, latencies_ms, strict=True
-            ):
-                latency_writer.writerow([float(latency_ms)])
-                times_writer.writerow([float(src_ts), float(recv_ts)])
+    # Binary float32 copy of the latencies for fast, memory-mappable loading.
+    latencies_f32 = (
+        np.concatenate(latency_blocks).astype(np.float32)
+        if latency_blocks
+        else np.empty(0, dtype=np.float32)
+    )
+    np.save(output_directory / LATENCY_NPY_FILE, latencies_f32)
+    # (N, 2) float64 [src_time, recv_time] rows, mirroring times.csv.
+    times_array = np.concatenate(times_blocks) if times_blocks else np.empty((0, 2))
+    np.save(output_directory / TIMES_NPY_FILE, times_array)
 
     summary = compute_metrics(
         collected_samples,
@@ -233,8 +264,11 @@ def measure(
         },
     }
 
-    with open(output_directory / "summary.json", "w") as summary_file:
-        json.dump({**summary_dict, **metadata}, summary_file, indent=2)
+    # Serialize once and write in a single call; json.dump would issue one
+    # write per token.
+    (output_directory / SUMMARY_JSON_FILE).write_text(
+        json.dumps({**summary_dict, **metadata}, indent=2), encoding="utf-8"
+    )
 
     # Optionally print a concise summary table of key metrics
     if settings.print_summary:
@@ -291,9 +325,10 @@ def measure(
 
     print("[bold green]Done[/] ->", output_directory)
 
-    # Optional: print compact JSON summary to stdout for scripting
+    # Optional: print compact JSON summary to stdout for scripting. Bypass rich
+    # so the blob is neither wrapped nor parsed for markup.
     if settings.json_summary:
-        print(json.dumps(summary.__dict__, separators=(",", ":")))
+        typer.echo(json.dumps(summary.__dict__, separators=(",", ":")))
 
 
 @app.command()
@@ -308,11 +343,23 @@ def report(
             ),
         ),
     ] = None,
+    inline_images: Annotated[
+        bool,
+        typer.Option(
+            "--inline-images/--no-inline-images",
+            help=(
+                "Embed plots in report.html as data URLs (single-file report), "
+                "or write them as PNG files next to it."
+            ),
+        ),
+    ] = True,
 ):
     """Render an HTML report from previously collected measurement artifacts.
 
     Args:
         run: Results directory that contains ``summary.json`` and related files.
+        inline_images: Whether to embed plots in the report instead of writing
+            separate PNG files.
 
     Raises:
         typer.BadParameter: If no run directory is available in non-interactive
@@ -334,7 +381,7 @@ def report(
             raise typer.BadParameter(
                 "No --run provided and default 'results/run_001' not found"
             )
-    render_html_report(selected)
+    render_html_report(selected, inline_images=inline_images)
 
 
 if __name__ == "__main__":
@@ -82,15 +82,18 @@ class InletWorker:
             data, ts = self.inlet.pull_chunk(
                 max_samples=self.chunk, timeout=self.timeout
             )
-            if ts:
+            # ``len`` rather than truthiness: pylsl may hand back ndarrays.
+            if len(ts):
                 recv = (
                     local_clock()
                 )  # Per pylsl docs: use a single (approximate) receive timestamp
                 # for the whole chunk
+                # ``asarray`` passes through arrays that already have the target
+                # dtype, avoiding a per-chunk copy.
                 self.ring.push(
                     (
-                        np.array(data, dtype=np.float32),
-                        np.array(ts, dtype=np.float64),
+                        np.asarray(data, dtype=np.float32),
+                        np.asarray(ts, dtype=np.float64),
                         recv,
                     )
                 )
@@ -5,49 +5,59 @@ human-readable HTML report using Jinja2 templates. It checks for required files
 constants for filenames and plotting parameters.
 """
 
+import base64
+import functools
+import io
 import json
 from pathlib import Path
 
 import jinja2
-
-# Third-party imports; set non-interactive backend before importing pyplot
-import matplotlib
-
-matplotlib.use("Agg")  # must be set before importing pyplot
-import matplotlib.pyplot as plt
 import numpy as np
 
 LATENCY_CSV_FILE = "latency.csv"
+LATENCY_NPY_FILE = "latency.npy"
 TIMES_CSV_FILE = "times.csv"
+TIMES_NPY_FILE = "times.npy"
 SUMMARY_JSON_FILE = "summary.json"
+LATENCY_HIST_FILE = "latency_hist.png"
+DRIFT_PLOT_FILE = "drift_plot.png"
 
 LATENCY_HIST_BINS = 50
 PLOT_DPI = 120
 MS_PER_SECOND = 1000.0
+CSV_READ_BUFFER_BYTES = 1 << 20
+# Upper bound on points drawn in the drift plot; longer series are strided.
+DRIFT_PLOT_MAX_POINTS = 1000
 
 
-def render_html_report(run_directory: Path) -> None:
+def render_html_report(run_directory: Path, inline_images: bool = True) -> None:
     """Generate an HTML report with plots from measurement run data.
 
     This function checks for the existence of required files (``summary.json``,
-    ``latency.csv``) in the specified run directory. It loads measurement
-    results, generates a latency histogram plot, and, if ``times.csv`` is
-    available, a drift plot. The report is rendered using a Jinja2 template and
-    written to ``report.html``.
+    and ``latency.npy`` or ``latency.csv``) in the specified run directory. It
+    loads measurement results, generates a latency histogram plot, and, if
+    ``times.npy`` or ``times.csv`` is available, a drift plot. The ``.npy``
+    artifacts are memory-mapped when present; the CSVs are read only as a
+    fallback for runs recorded before they existed. The report is rendered
+    using a Jinja2 template and written to ``report.html``.
 
     Args:
         run_directory (Path): Path to the directory containing the run data.
+        inline_images (bool): If True, embed the plots in ``report.html`` as
+            base64 PNG data URLs so the report is a single self-contained file.
+            If False, write them next to it as PNG files and link to those.
 
     Raises:
-        FileNotFoundError: If ``summary.json`` or ``latency.csv`` is missing in
-        the run directory.
+        FileNotFoundError: If ``summary.json`` is missing, or neither
+        ``latency.npy`` nor ``latency.csv`` exists in the run directory.
 
     Notes:
         - Uses constants for filenames and plotting parameters.
         - Creates the following files in ``run_directory``:
-            - ``latency_hist.png``: Histogram of latencies.
-            - ``drift_plot.png``: Plot of clock offset over time (optional).
             - ``report.html``: The final HTML report.
+            - ``latency_hist.png``: Histogram of latencies (file mode only).
+            - ``drift_plot.png``: Plot of clock offset over time (file mode
+              only; optional).
     """
     # Convert input to Path if not already
     run_directory = Path(run_directory)
@@ -58,54 +68,173 @@ def render_html_report(run_directory: Path) -> None:
         raise FileNotFoundError(f"Missing required file: {summary_file_path}")
     summary = json.loads(summary_file_path.read_text(encoding="utf-8"))
 
-    # --- Generate latency histogram plot ---
+    # --- Generate plots ---
     latency_file_path = run_directory / LATENCY_CSV_FILE
-    if not latency_file_path.exists():
-        raise FileNotFoundError(f"Missing required file: {latency_file_path}")
-    latency_values = np.loadtxt(latency_file_path, delimiter=",", skiprows=1, ndmin=1)
-    plt.figure()
-    plt.hist(latency_values, bins=LATENCY_HIST_BINS)
-    plt.xlabel("Latency (ms)")
-    plt.ylabel("Count")
-    plt.title("Latency Histogram")
-    plt.savefig(
-        run_directory / "latency_hist.png",
-        dpi=PLOT_DPI,
-        bbox_inches="tight",
-    )
-    plt.close()
-
-    # --- Generate drift plot if times.csv exists ---
-    drift_plot_exists = False
-    times_file_path = run_directory / TIMES_CSV_FILE
-    if times_file_path.exists():
-        times_data = np.loadtxt(times_file_path, delimiter=",", skiprows=1)
-        # If only one row is present, np.loadtxt returns a 1D array;
-        # reshape to 2D for consistency
-        if times_data.ndim == 1:
-            times_data = times_data[None, :]
-        source_times = times_data[:, 0]
-        received_times = times_data[:, 1]
-        offset_milliseconds = (received_times - source_times) * MS_PER_SECOND
-        elapsed_seconds = source_times - source_times[0]
-        plt.figure()
-        plt.plot(elapsed_seconds, offset_milliseconds)
-        plt.xlabel("Time (s)")
-        plt.ylabel("Offset (ms)")
-        plt.title("Offset vs Time (Drift)")
-        plt.savefig(
-            run_directory / "drift_plot.png",
-            dpi=PLOT_DPI,
-            bbox_inches="tight",
+    latency_npy_path = run_directory / LATENCY_NPY_FILE
+    if not (latency_file_path.exists() or latency_npy_path.exists()):
+        raise FileNotFoundError(
+            f"Missing required file: {latency_npy_path} or {latency_file_path}"
         )
-        plt.close()
-        drift_plot_exists = True
+    latency_hist_src, drift_plot_src = _generate_plots(
+        run_directory, inline_images=inline_images
+    )
 
     # --- Render HTML report using Jinja2 template ---
+    html_report = _report_template().render(
+        latency_hist_src=latency_hist_src, drift_plot_src=drift_plot_src, **summary
+    )
+    (run_directory / "report.html").write_text(html_report, encoding="utf-8")
+
+
+@functools.cache
+def _report_template() -> jinja2.Template:
+    """Load and compile the HTML report template once per process.
+
+    Returns:
+        jinja2.Template: The compiled ``report.html.j2`` template.
+    """
     jinja_env = jinja2.Environment(
         loader=jinja2.FileSystemLoader(Path(__file__).parent / "templates"),
         autoescape=False,
     )
-    template = jinja_env.get_template("report.html.j2")
-    html_report = template.render(drift_plot=drift_plot_exists, **summary)
-    (run_directory / "report.html").write_text(html_report, encoding="utf-8")
+    return jinja_env.get_template("report.html.j2")
+
+
+@functools.cache
+def _plot_canvas():
+    """Return the module's reusable matplotlib figure and axes.
+
+    The figure is created once, without pyplot, and reused for every plot so
+    batch rendering skips per-plot figure construction. Built lazily so that
+    callers which never plot (or tests that stub plotting) skip the matplotlib
+    import cost. Rendering is not thread-safe; reports are rendered serially.
+
+    Returns:
+        tuple[matplotlib.figure.Figure, matplotlib.axes.Axes]: Shared figure and
+        its single axes.
+    """
+    from matplotlib.figure import Figure
+
+    figure = Figure()
+    return figure, figure.add_subplot()
+
+
+def _generate_plots(
+    run_directory: Path, *, inline_images: bool
+) -> tuple[str, str | None]:
+    """Render the latency histogram and, if possible, the drift plot.
+
+    Both plots are drawn on the shared figure from :func:`_plot_canvas`, which
+    is cleared before each one. ``Figure`` renders through the Agg canvas
+    directly, so no GUI backend is ever selected.
+
+    Args:
+        run_directory (Path): Directory containing the latency artifact and,
+            optionally, the times artifact. In file mode plots are written
+            alongside them.
+        inline_images (bool): Return base64 data URLs instead of writing files.
+
+    Returns:
+        tuple[str, str | None]: Image ``src`` values for the latency histogram
+        and the drift plot; the drift entry is None if there was no drift plot.
+    """
+    figure, axes = _plot_canvas()
+
+    # --- Generate latency histogram plot ---
+    latency_values = _load_latencies(run_directory)
+    # Pre-bin with NumPy so matplotlib only draws LATENCY_HIST_BINS bars
+    # instead of walking every sample.
+    counts, edges = np.histogram(latency_values, bins=LATENCY_HIST_BINS)
+    axes.cla()
+    axes.bar(edges[:-1], counts, width=np.diff(edges), align="edge")
+    axes.set_xlabel("Latency (ms)")
+    axes.set_ylabel("Count")
+    axes.set_title("Latency Histogram")
+    latency_hist_src = _save_plot(
+        figure, run_directory / LATENCY_HIST_FILE, inline_images
+    )
+
+    # --- Generate drift plot if a times artifact exists ---
+    drift_plot_src = None
+    times_data = _load_times(run_directory)
+    # An empty times artifact (no samples received) has no drift to plot.
+    if times_data is not None and len(times_data):
+        # A line plot cannot show more points than the figure has pixels, so
+        # stride long runs down before computing offsets and drawing.
+        stride = max(1, -(-len(times_data) // DRIFT_PLOT_MAX_POINTS))
+        source_times = times_data[::stride, 0]
+        received_times = times_data[::stride, 1]
+        offset_milliseconds = (received_times - source_times) * MS_PER_SECOND
+        elapsed_seconds = source_times - source_times[0]
+        axes.cla()
+        axes.plot(elapsed_seconds, offset_milliseconds)
+        axes.set_xlabel("Time (s)")
+        axes.set_ylabel("Offset (ms)")
+        axes.set_title("Offset vs Time (Drift)")
+        drift_plot_src = _save_plot(
+            figure, run_directory / DRIFT_PLOT_FILE, inline_images
+        )
+    return latency_hist_src, drift_plot_src
+
+
+def _save_plot(figure, plot_path: Path, inline_images: bool) -> str:
+    """Render ``figure`` as PNG and return the ``src`` the report should use.
+
+    Args:
+        figure (matplotlib.figure.Figure): Figure to render.
+        plot_path (Path): Destination file in file mode; its name is the
+            returned ``src``.
+        inline_images (bool): Render into memory and return a base64 data URL
+            instead of writing ``plot_path``.
+
+    Returns:
+        str: Relative file name or ``data:image/png;base64,...`` URL.
+    """
+    if not inline_images:
+        figure.savefig(plot_path, dpi=PLOT_DPI, bbox_inches="tight")
+        return plot_path.name
+    png_buffer = io.BytesIO()
+    figure.savefig(png_buffer, format="png", dpi=PLOT_DPI, bbox_inches="tight")
+    encoded = base64.b64encode(png_buffer.getbuffer()).decode("ascii")
+    return f"data:image/png;base64,{encoded}"
+
+
+def _load_latencies(run_directory: Path) -> np.ndarray:
+    """Load per-sample latencies, preferring the memory-mapped ``latency.npy``.
+
+    Args:
+        run_directory (Path): Directory containing ``latency.npy`` or
+            ``latency.csv``.
+
+    Returns:
+        np.ndarray: 1-D array of latencies in milliseconds.
+    """
+    npy_path = run_directory / LATENCY_NPY_FILE
+    if npy_path.exists():
+        return np.load(npy_path, mmap_mode="r")
+    with open(
+        run_directory / LATENCY_CSV_FILE, "rb", buffering=CSV_READ_BUFFER_BYTES
+    ) as f:
+        return np.loadtxt(f, delimiter=",", skiprows=1, ndmin=1, dtype=np.float32)
+
+
+def _load_times(run_directory: Path) -> np.ndarray | None:
+    """Load source/receive timestamps, preferring the memory-mapped ``times.npy``.
+
+    Args:
+        run_directory (Path): Directory that may contain ``times.npy`` or
+            ``times.csv``.
+
+    Returns:
+        np.ndarray | None: ``(N, 2)`` array of ``[src_time, recv_time]`` rows, or
+        None if neither file exists.
+    """
+    npy_path = run_directory / TIMES_NPY_FILE
+    if npy_path.exists():
+        return np.load(npy_path, mmap_mode="r")
+    csv_path = run_directory / TIMES_CSV_FILE
+    if not csv_path.exists():
+        return None
+    # ndmin=2 keeps a single-row file shaped (1, 2).
+    with open(csv_path, "rb", buffering=CSV_READ_BUFFER_BYTES) as f:
+        return np.loadtxt(f, delimiter=",", skiprows=1, usecols=(0, 1), ndmin=2)
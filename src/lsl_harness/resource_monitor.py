@@ -4,12 +4,14 @@ Provides a ResourceMonitor for periodic CPU/memory sampling and a ResourceUsage
 dataclass for summary stats.
 """
 
-from collections.abc import Callable, Sequence
+import threading
+from collections.abc import Callable
 from dataclasses import dataclass
-from statistics import fmean
-from time import monotonic
+from time import monotonic_ns
 from typing import Any
 
+import numpy as np
+
 # Try to import psutil for resource monitoring; handle missing dependency gracefully.
 try:  # pragma: no cover - import is only exercised at runtime, not during tests
     import psutil as _psutil  # type: ignore
@@ -40,20 +42,34 @@ class ResourceUsage:
     system_cpu_percent_avg: float | None
     system_cpu_percent_per_core_avg: tuple[float, ...]
 
+    @property
+    def per_core_array(self) -> np.ndarray:
+        """Return the per-core CPU averages as a float64 NumPy array.
+
+        Returns:
+            np.ndarray: One average CPU percent per core; empty if unavailable.
+        """
+        return np.asarray(self.system_cpu_percent_per_core_avg, dtype=np.float64)
+
 
 class ResourceMonitor:
     """Periodically sample CPU and memory usage for the current process.
 
     Collects process and system CPU usage and memory (RSS) at a fixed interval.
-    Samples are aggregated for summary statistics via the snapshot() method.
+    Sampling is either driven by the caller through maybe_sample(), or runs on
+    a background daemon thread after start() so psutil calls stay off the
+    acquisition loop. Samples are aggregated for summary statistics via the
+    snapshot() method.
     """
 
+    _JOIN_TIMEOUT = 2.0
+
     def __init__(
         self,
         *,
         sample_interval_seconds: float = 0.5,
         psutil_module: Any | None = None,
-        monotonic_fn: Callable[[], float] | None = None,
+        monotonic_ns_fn: Callable[[], int] | None = None,
     ) -> None:
         """Initialize a resource monitor.
 
@@ -61,12 +77,15 @@ class ResourceMonitor:
             sample_interval_seconds (float): Minimum seconds between samples.
             psutil_module (Any | None):
                 Optional injected psutil-like module for testing.
-            monotonic_fn (Callable[[], float] | None):
-                Optional injected monotonic clock for testing.
+            monotonic_ns_fn (Callable[[], int] | None):
+                Optional injected monotonic clock returning integer nanoseconds,
+                for testing. Defaults to ``time.monotonic_ns``.
 
         Raises:
             ValueError: If sample_interval_seconds is not positive.
             RuntimeError: If psutil is not available and not injected.
+            TypeError: If ``monotonic_ns_fn`` returns a float (seconds) rather
+                than integer nanoseconds.
         """
         if sample_interval_seconds <= 0:
             raise ValueError("sample_interval_seconds must be positive")
@@ -82,12 +101,23 @@ class ResourceMonitor:
 
         self._psutil = psutil_module
         self._interval = sample_interval_seconds
-        self._monotonic = monotonic_fn or monotonic
-        self._last_sample_time = self._monotonic()
+        # Integer nanoseconds keep the interval check free of float rounding.
+        self._interval_ns = round(sample_interval_seconds * 1e9)
+        self._monotonic = monotonic_ns_fn or monotonic_ns
+        self._last_sample_ns = _require_ns(self._monotonic(), "monotonic_ns_fn()")
         self._process = self._psutil.Process()
-        self._process_cpu_samples: list[float] = []
-        self._rss_samples: list[float] = []
-        self._system_cpu_per_core_samples: list[tuple[float, ...]] = []
+        # Running sums and counts: only the averages are reported, so raw
+        # samples are never kept and snapshot() is O(1) at any run length.
+        self._process_cpu_sum = 0.0
+        self._rss_sum = 0.0
+        self._sample_count = 0
+        # Sized on the first per-core sample, once the core count is known.
+        self._per_core_sum: np.ndarray | None = None
+        self._per_core_count = 0
+        # Guards the sample buffers against the background sampler thread.
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
 
         # Prime psutil's internal counters so subsequent calls measure deltas.
         self._process.cpu_percent(interval=None)
@@ -99,47 +129,104 @@ class ResourceMonitor:
             # per-core stats
             self._per_core_supported = False
 
-    def maybe_sample(self, *, now: float | None = None) -> bool:
+    def start(self) -> None:
+        """Start sampling on a background daemon thread.
+
+        The thread records one sample per interval until finalize() is
+        called. Calling start() again while the thread is running is a no-op.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Record a sample every interval until the stop event is set.
+
+        Pacing comes from ``Event.wait``, so the thread never touches the
+        ``maybe_sample_at`` bookkeeping owned by the caller's thread.
+        """
+        while not self._stop.wait(self._interval):
+            self._record_sample()
+
+    def maybe_sample(self, *, now_ns: int | None = None) -> bool:
         """Record a sample if the configured interval has elapsed.
 
+        Callers that already hold a monotonic timestamp should prefer
+        :meth:`maybe_sample_at`, which skips the clock read.
+
+        Args:
+            now_ns (int | None): Optional timestamp override in nanoseconds (for
+                testing).
+
+        Returns:
+            bool: True if a sample was recorded, False otherwise.
+
+        Raises:
+            TypeError: If ``now_ns`` is a float, i.e. a timestamp in seconds.
+        """
+        if now_ns is None:
+            now_ns = self._monotonic()
+        else:
+            _require_ns(now_ns, "now_ns")
+        return self.maybe_sample_at(now_ns)
+
+    def maybe_sample_at(self, now_ns: int) -> bool:
+        """Record a sample at ``now_ns`` if the configured interval has elapsed.
+
+        This is the unchecked fast path: ``now_ns`` is not validated, so it
+        must be integer nanoseconds from the same clock the monitor was built
+        with (a float seconds value would never pass the interval check).
+
         Args:
-            now (float | None): Optional timestamp override (for testing).
+            now_ns (int): Current timestamp in nanoseconds from the monitor's
+                monotonic clock.
 
         Returns:
             bool: True if a sample was recorded, False otherwise.
         """
-        timestamp = now if now is not None else self._monotonic()
-        if timestamp - self._last_sample_time < self._interval:
+        if now_ns - self._last_sample_ns < self._interval_ns:
             return False
-        self._last_sample_time = timestamp
+        self._last_sample_ns = now_ns
         self._record_sample()
         return True
 
     def finalize(self) -> None:
-        """Force a final sample to capture end-of-run resource usage.
+        """Stop any background sampler and force a final sample.
 
         Useful for ensuring the last state is recorded before shutdown.
         """
-        self._last_sample_time = self._monotonic()
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(self._JOIN_TIMEOUT)
+            self._thread = None
+        self._last_sample_ns = self._monotonic()
         self._record_sample()
 
     def snapshot(self) -> ResourceUsage | None:
         """Return aggregate statistics for collected samples.
 
+        Averages are derived from running sums, so this is constant-time and
+        safe to call while a background sampler is running.
+
         Returns:
             ResourceUsage | None: Aggregated resource usage, or None if no samples.
         """
-        if not self._process_cpu_samples:
-            return None
-
-        process_cpu_avg = fmean(self._process_cpu_samples)
-        process_rss_avg = fmean(self._rss_samples)
-        if self._system_cpu_per_core_samples:
-            per_core_avg = _mean_per_index(self._system_cpu_per_core_samples)
-            system_cpu_avg: float | None = fmean(per_core_avg)
-        else:
-            per_core_avg = ()
-            system_cpu_avg = None
+        with self._lock:
+            count = self._sample_count
+            if count == 0:
+                return None
+
+            process_cpu_avg = self._process_cpu_sum / count
+            process_rss_avg = self._rss_sum / count
+            if self._per_core_sum is not None:
+                per_core_means = self._per_core_sum / self._per_core_count
+                per_core_avg = tuple(per_core_means.tolist())
+                system_cpu_avg: float | None = float(per_core_means.mean())
+            else:
+                per_core_avg = ()
+                system_cpu_avg = None
 
         return ResourceUsage(
             process_cpu_percent_avg=process_cpu_avg,
@@ -150,35 +237,54 @@ class ResourceMonitor:
 
     def _record_sample(self) -> None:
         """Sample process and system resource usage and store results."""
-        cpu_percent = float(self._process.cpu_percent(interval=None))
-        rss_bytes = float(self._process.memory_info().rss)
-        self._process_cpu_samples.append(cpu_percent)
-        self._rss_samples.append(rss_bytes)
-
+        cpu_percent = self._process.cpu_percent(interval=None)
+        rss_bytes = self._process.memory_info().rss
+        per_core = None
         if self._per_core_supported:
-            per_core = tuple(
-                float(value)
-                for value in self._psutil.cpu_percent(interval=None, percpu=True)
-            )
-            if per_core:
-                self._system_cpu_per_core_samples.append(per_core)
+            per_core = self._psutil.cpu_percent(interval=None, percpu=True)
 
+        with self._lock:
+            self._store_sample(cpu_percent, rss_bytes, per_core)
 
-def _mean_per_index(samples: Sequence[Sequence[float]]) -> tuple[float, ...]:
-    """Compute the mean for each index across a sequence of sequences.
+    def _store_sample(
+        self, cpu_percent: float, rss_bytes: float, per_core: Any
+    ) -> None:
+        """Add one sample to the running sums.
+
+        Must be called with ``_lock`` held.
+
+        Args:
+            cpu_percent (float): Process CPU percent.
+            rss_bytes (float): Process resident set size in bytes.
+            per_core (Any): Per-core CPU percentages, or None if unsupported.
+        """
+        self._process_cpu_sum += cpu_percent
+        self._rss_sum += rss_bytes
+        self._sample_count += 1
+
+        if per_core is not None and len(per_core):
+            if self._per_core_sum is None:
+                self._per_core_sum = np.zeros(len(per_core))
+            self._per_core_sum += per_core
+            self._per_core_count += 1
+
+
+def _require_ns(timestamp: int, name: str) -> int:
+    """Reject float timestamps, which indicate seconds rather than nanoseconds.
 
     Args:
-        samples (Sequence[Sequence[float]]): List of tuples/lists of floats.
+        timestamp (int): Timestamp that should be in integer nanoseconds.
+        name (str): Parameter or callable name used in the error message.
 
     Returns:
-        tuple[float, ...]: Mean for each index position.
+        int: ``timestamp`` unchanged.
+
+    Raises:
+        TypeError: If ``timestamp`` is a float.
     """
-    counts = len(samples)
-    if counts == 0:
-        return ()
-    length = len(samples[0])
-    totals = [0.0] * length
-    for sample in samples:
-        for idx, value in enumerate(sample):
-            totals[idx] += value
-    return tuple(total / counts for total in totals)
+    if isinstance(timestamp, float):
+        raise TypeError(
+            f"{name} must be integer nanoseconds (e.g. time.monotonic_ns()), "
+            f"got float {timestamp!r}"
+        )
+    return timestamp
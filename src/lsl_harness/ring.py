@@ -1,18 +1,20 @@
 """A thread-safe, fixed-capacity ring buffer."""
 
 import threading
-from collections import deque
 
 
 class Ring:
     """A thread-safe, fixed-capacity ring buffer for LSL chunks.
 
-    This class implements a deque-based ring buffer with a configurable drop
-    policy (either drop oldest or reject newest when full). It is designed to
-    be thread-safe for one producer and one consumer.
+    This class implements a ring buffer over a preallocated list with a
+    configurable drop policy (either drop oldest or reject newest when full).
+    Pushing never allocates in steady state. A single lock guards every
+    operation, so it is safe for any number of producers and consumers; the
+    harness itself uses one of each. A ring created with ``blocking=True`` also
+    lets consumers sleep in drain_upto() until a push wakes them, instead of
+    polling.
 
     Attributes:
-        q (collections.deque): The underlying deque instance.
         capacity (int): The maximum capacity of the ring buffer.
         drop_oldest (bool): If True, the oldest item is dropped when the buffer is full.
             If False, the newest item is rejected.
@@ -20,19 +22,52 @@ class Ring:
         drops (int): Counter for the number of dropped or rejected items.
     """
 
-    def __init__(self, capacity: int, drop_oldest: bool = True) -> None:
+    # Fixed slots make attribute access in push/drain_upto cheaper and keep
+    # each ring free of a per-instance __dict__.
+    __slots__ = (
+        "capacity",
+        "drop_oldest",
+        "lock",
+        "drops",
+        "_buf",
+        "_head",
+        "_tail",
+        "_size",
+        "_not_empty",
+    )
+
+    def __init__(
+        self, capacity: int, drop_oldest: bool = True, blocking: bool = False
+    ) -> None:
         """Initialize the Ring buffer.
 
         Args:
             capacity (int): The maximum number of items the ring can hold.
             drop_oldest (bool): The policy for handling a full buffer. If True, the
                 oldest item is overwritten. If False, the new item is rejected.
+            blocking (bool): If True, drain_upto() waits on a condition variable
+                for items to arrive instead of returning immediately when empty.
+
+        Raises:
+            ValueError: If ``capacity`` is less than 1.
         """
-        self.q = deque(maxlen=capacity if drop_oldest else None)
+        if capacity < 1:
+            raise ValueError(f"Ring capacity must be at least 1, got {capacity}")
         self.capacity = capacity
         self.drop_oldest = drop_oldest
         self.lock = threading.Lock()
         self.drops = 0  # count of overwritten or rejected items
+        self._buf: list = [None] * capacity
+        self._head = 0  # index of the oldest item
+        self._tail = 0  # index the next item is written to
+        self._size = 0
+        # Shares ``lock``; only created for blocking rings so the default
+        # push path never notifies.
+        self._not_empty = threading.Condition(self.lock) if blocking else None
+
+    def __len__(self) -> int:
+        """Return the number of items currently buffered."""
+        return self._size
 
     def push(self, item: object) -> bool:
         """Add an item to the ring buffer.
@@ -47,30 +82,116 @@ class Ring:
             bool: True if the item was added, False if it was rejected.
         """
         with self.lock:
-            if not self.drop_oldest and len(self.q) >= self.capacity:
-                self.drops += 1  # reject newest
-                return False
-            # Check if buffer was full before appending (to count overwrites)
-            before_full = (len(self.q) == self.q.maxlen) if self.q.maxlen else False
-            self.q.append(item)
-            if self.q.maxlen and before_full:
-                self.drops += 1  # leftmost overwritten
+            full = self._size == self.capacity
+            if full and not self.drop_oldest:
+                self.drops += 1
+                return False  # reject newest
+            # One straight-line path for both cases: when full, head and tail
+            # coincide, so the write overwrites the oldest slot and ``full``
+            # (0 or 1) advances head and counts the drop instead of growing size.
+            self.drops += full
+            self._buf[self._tail] = item
+            self._tail = (self._tail + 1) % self.capacity
+            self._head = (self._head + full) % self.capacity
+            self._size += not full
+            if self._not_empty is not None and self._size == 1:
+                self._not_empty.notify()  # ring just became non-empty
             return True
 
-    def drain_upto(self, max_items: int) -> list:
+    def drain_upto(self, max_items: int, timeout: float | None = None) -> list:
         """Remove and return up to a specified number of items from the buffer.
 
-        This method drains items from the left (oldest) of the buffer.
+        This method drains items from the oldest end of the buffer. Drained
+        slots are cleared so the ring does not keep chunks alive. On a
+        non-blocking ring an empty buffer is detected without taking the lock,
+        so idle polling stays cheap. On a blocking ring the call waits until an
+        item is pushed or ``timeout`` expires.
 
         Args:
             max_items (int): The maximum number of items to remove.
+            timeout (float | None): Blocking rings only: seconds to wait for an
+                item, or None to wait indefinitely. Ignored otherwise.
 
         Returns:
             list: Items from the buffer, containing at most max_items items.
+                Empty if nothing arrived before the timeout.
+        """
+        if self._not_empty is not None:
+            with self._not_empty:
+                if not self._not_empty.wait_for(self.__len__, timeout):
+                    return []
+                items = self._drain(max_items)
+                if self._size:
+                    # Items remain after a partial drain; pass the wakeup on
+                    # to another waiting consumer.
+                    self._not_empty.notify()
+                return items
+        # Unlocked fast path for the common empty poll. Reading an int is
+        # atomic; a stale zero only defers the items to the next call.
+        if self._size == 0:
+            return []
+        with self.lock:
+            return self._drain(max_items)
+
+    def _drain(self, max_items: int) -> list:
+        """Remove up to ``max_items`` items from the head.
+
+        Must be called with ``lock`` held.
+
+        Args:
+            max_items (int): The maximum number of items to remove.
+
+        Returns:
+            list: The removed items, oldest first.
+        """
+        size = self._size
+        if max_items >= size:
+            # Draining everything is the common case: the ring ends up
+            # empty, so the indices can be reset without modulo arithmetic.
+            items = self._take(size, clear=True)
+            self._head = self._tail = self._size = 0
+            return items
+        count = max_items
+        if count <= 0:
+            return []
+        items = self._take(count, clear=True)
+        self._head = (self._head + count) % self.capacity
+        self._size -= count
+        return items
+
+    def snapshot(self) -> list:
+        """Return the buffered items, oldest first, without removing them.
+
+        Returns:
+            list: A copy of the current buffer contents.
         """
-        items = []
-        # Remove up to max_items from the left (oldest) of the buffer
         with self.lock:
-            for _ in range(min(max_items, len(self.q))):
-                items.append(self.q.popleft())
+            return self._take(self._size, clear=False)
+
+    def _take(self, count: int, *, clear: bool) -> list:
+        """Copy ``count`` items from the head, in at most two slices.
+
+        Must be called with ``lock`` held.
+
+        Args:
+            count (int): Number of items to copy; at most the current size.
+            clear (bool): Whether to reset the copied slots to ``None``.
+
+        Returns:
+            list: The copied items, oldest first.
+        """
+        buf = self._buf
+        head = self._head
+        end = head + count
+        if end <= self.capacity:
+            items = buf[head:end]
+            if clear:
+                buf[head:end] = [None] * count
+            return items
+        # The span wraps past the end of the backing list.
+        end -= self.capacity
+        items = buf[head:] + buf[:end]
+        if clear:
+            buf[head:] = [None] * (self.capacity - head)
+            buf[:end] = [None] * end
         return items
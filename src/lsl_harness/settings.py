@@ -17,6 +17,21 @@ try:  # Python >=3.11
 except ModuleNotFoundError:  # pragma: no cover - fallback for older versions
     tomllib = None  # type: ignore
 
+_BOOL_MAP: Mapping[str, bool] = {
+    "1": True,
+    "true": True,
+    "t": True,
+    "yes": True,
+    "y": True,
+    "on": True,
+    "0": False,
+    "false": False,
+    "f": False,
+    "no": False,
+    "n": False,
+    "off": False,
+}
+
 
 def _to_bool(value: Any) -> bool:
     """Coerce an arbitrary value to a boolean.
@@ -37,11 +52,9 @@ def _to_bool(value: Any) -> bool:
     if isinstance(value, int | float):
         return bool(value)
     if isinstance(value, str):
-        normalized = value.strip().lower()
-        if normalized in {"1", "true", "t", "yes", "y", "on"}:
-            return True
-        if normalized in {"0", "false", "f", "no", "n", "off"}:
-            return False
+        result = _BOOL_MAP.get(value.strip().lower())
+        if result is not None:
+            return result
     raise ValueError(f"Cannot interpret {value!r} as a boolean")
 
 
@@ -165,15 +178,13 @@ class MeasureSettings:
             Mapping of dataclass field names to parsed values. Only environment
             variables that are present and non-empty are included.
         """
+        casters = cls._FIELD_CASTERS
         loaded: dict[str, Any] = {}
         for field_name, env_key in cls._ENV_KEYS.items():
-            if env_key not in env:
-                continue
-            raw_value = env[env_key]
-            if raw_value == "":
+            raw_value = env.get(env_key)
+            if not raw_value:
                 continue
-            caster = cls._FIELD_CASTERS[field_name]
-            loaded[field_name] = caster(raw_value)
+            loaded[field_name] = casters[field_name](raw_value)
         return loaded
 
     @classmethod
@@ -216,11 +227,12 @@ class MeasureSettings:
         if not isinstance(section, Mapping):
             raise ValueError("Settings file 'measure' section must be a mapping")
 
+        casters = cls._FIELD_CASTERS
         result: dict[str, Any] = {}
         for key, value in section.items():
-            if key not in cls._FIELD_CASTERS:
+            caster = casters.get(key)
+            if caster is None:
                 continue
-            caster = cls._FIELD_CASTERS[key]
             result[key] = caster(value)
         return result
 
@@ -0,0 +1,178 @@
+"""Shared pytest fixtures for the lsl-harness test suite.
+
+The real `pylsl` package requires native libraries that are not available in the
+unit-test environment.  A lightweight shim is therefore installed into
+``sys.modules`` before any test module is collected so :mod:`lsl_harness.measure`
+can be imported without error.  The shim is intentionally minimal—only the
+attributes used by the tests are implemented.
+"""
+
+import importlib
+import json
+import shutil
+import sys
+import types
+from collections.abc import Callable
+
+import pytest
+
+from lsl_harness.report import LATENCY_CSV_FILE, SUMMARY_JSON_FILE
+
+
+class FakePylslShim(types.ModuleType):
+    """Minimal shim for the `pylsl` module for unit testing.
+
+    This class simulates the essential attributes and methods of the `pylsl`
+    module required for importing and testing `lsl_harness.measure` without
+    native dependencies.
+    """
+
+    StreamInlet: type
+    local_clock: Callable[[], float]
+    resolve_byprop: Callable[..., list]
+    resolve_stream: Callable[..., list]
+
+    def __init__(self):
+        """Initialize the FakePylslShim with stub attributes."""
+        super().__init__("pylsl")
+        self.StreamInlet = object
+        self.local_clock = lambda: 0.0
+        self.resolve_byprop = lambda *args, **kwargs: []
+        self.resolve_stream = lambda *args, **kwargs: []
+
+
+sys.modules.setdefault("pylsl", FakePylslShim())
+
+
+class DummyThread:
+    """Minimal thread stand-in that records daemon usage.
+
+    Used to simulate threading.Thread behavior for unit tests.
+    """
+
+    def __init__(self, target: Callable | None = None, daemon: bool | None = None):
+        """Initialise the dummy thread.
+
+        Args:
+            target (Callable | None): Callable that would normally run on the
+                thread. Stored for completeness so tests can assert it was set.
+            daemon (bool | None): Whether the thread should be a daemon. Tests
+                verify this flag is propagated from :class:`InletWorker`.
+        """
+        self.target = target
+        self.daemon = daemon
+        self.started = False
+        self.join_timeout = None
+
+    def start(self):
+        """Record that the thread would have been started."""
+        self.started = True
+
+    def join(self, timeout):
+        """Capture the timeout passed to ``Thread.join`` for assertions.
+
+        Args:
+            timeout (float): Timeout value passed to join.
+        """
+        self.join_timeout = timeout
+
+    def is_alive(self):
+        """Pretend the thread has already stopped.
+
+        Returns:
+            bool: Always False for dummy thread.
+        """
+        return False
+
+
+@pytest.fixture(scope="session")
+def measure_module():
+    """Import :mod:`lsl_harness.measure` once, after the pylsl shim is installed.
+
+    Returns:
+        types.ModuleType: The production ``lsl_harness.measure`` module.
+    """
+    return importlib.import_module("lsl_harness.measure")
+
+
+@pytest.fixture(scope="session")
+def dummy_thread_cls():
+    """Provide the shared :class:`DummyThread` class.
+
+    Returns:
+        type[DummyThread]: Thread stand-in usable in place of ``threading.Thread``.
+    """
+    return DummyThread
+
+
+# Minimal summary.json payload accepted by the report template, serialized
+# once at import. Shared by the report and CLI report tests.
+_SUMMARY_DATA = {
+    "p50_ms": 10.0,
+    "p95_ms": 20.0,
+    "p99_ms": 30.0,
+    "max_latency_ms": 40.0,
+    "jitter_ms": 10.0,
+    "jitter_std": 2.0,
+    "effective_sample_rate_hz": 1000.0,
+    "drops_percentage": 5.0,
+    "total_sample_count": 100,
+    "ring_drops": 5,
+    "isi_mean_ms": 1.0,
+    "isi_std_ms": 0.1,
+    "isi_p50_ms": 1.0,
+    "isi_p95_ms": 1.1,
+    "isi_p99_ms": 1.2,
+    "rr_mean_ms": 10.0,
+    "rr_std_ms": 0.5,
+    "drift_ms_per_min": 1.0,
+    "sequence_discontinuities": 1,
+    "process_cpu_percent_avg": None,
+    "process_rss_avg_bytes": None,
+    "system_cpu_percent_avg": None,
+    "system_cpu_percent_per_core_avg": [],
+    "parameters": {
+        "selector": {"key": "type", "value": "EEG"},
+        "duration_seconds": 10,
+        "chunk_size": 32,
+        "nominal_sample_rate": 1000,
+    },
+    "environment": {
+        "python": "3.11",
+        "platform": "linux",
+        "pylsl_version": "1.16.2",
+    },
+}
+_SUMMARY_JSON_BYTES = json.dumps(_SUMMARY_DATA, separators=(",", ":")).encode()
+
+
+@pytest.fixture(scope="session")
+def _report_input_template(tmp_path_factory):
+    """Write the canonical report inputs once per session.
+
+    Args:
+        tmp_path_factory (pytest.TempPathFactory): Session temp directory factory.
+
+    Returns:
+        Path: Directory holding ``summary.json`` and ``latency.csv``.
+    """
+    base_dir = tmp_path_factory.mktemp("report_template")
+    (base_dir / SUMMARY_JSON_FILE).write_bytes(_SUMMARY_JSON_BYTES)
+    (base_dir / LATENCY_CSV_FILE).write_bytes(b"latency_ms\n10.0\n20.0\n")
+    return base_dir
+
+
+@pytest.fixture
+def run_directory(tmp_path, _report_input_template):
+    """Provide a private copy of the canonical report inputs.
+
+    Args:
+        tmp_path (Path): Per-test temporary directory.
+        _report_input_template (Path): Session-wide directory to copy from.
+
+    Returns:
+        Path: Run directory holding ``summary.json`` and ``latency.csv``.
+    """
+    run_dir = tmp_path / "test_run"
+    shutil.copytree(_report_input_template, run_dir)
+    return run_dir
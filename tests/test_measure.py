@@ -1,105 +1,31 @@
 """Regression tests for :mod:`lsl_harness.measure`.
 
-The real `pylsl` package requires native libraries that are not available in the
-unit-test environment.  A lightweight shim is therefore installed into
-``sys.modules`` so the :mod:`lsl_harness.measure` module can be imported without
-error.  The shim is intentionally minimal—only the attributes used by the
-tests are implemented.
+The module under test is provided by the session-scoped ``measure_module``
+fixture in ``conftest.py``, which installs a lightweight ``pylsl`` shim before
+importing it so no native liblsl library is required.
 """
 
-import importlib
-import sys
-import types
 import warnings
-from collections.abc import Callable
 
 import numpy as np
 import pytest
 
 
-class FakePylslShim(types.ModuleType):
-    """Minimal shim for the `pylsl` module for unit testing.
-
-    This class simulates the essential attributes and methods of the `pylsl`
-    module required for importing and testing `lsl_harness.measure` without
-    native dependencies.
-    """
-
-    StreamInlet: type
-    local_clock: Callable[[], float]
-    resolve_byprop: Callable[..., list]
-    resolve_stream: Callable[..., list]
-
-    def __init__(self):
-        """Initialize the FakePylslShim with stub attributes."""
-        super().__init__("pylsl")
-        self.StreamInlet = object
-        self.local_clock = lambda: 0.0
-        self.resolve_byprop = lambda *args, **kwargs: []
-        self.resolve_stream = lambda *args, **kwargs: []
-
-
-sys.modules.setdefault("pylsl", FakePylslShim())
-# Import the production module only after the stub is installed so importing
-# ``pylsl`` within :mod:`lsl_harness.measure` succeeds in the test environment.
-measure = importlib.import_module("lsl_harness.measure")
-InletWorker = measure.InletWorker
-
-
-class DummyThread:
-    """Minimal thread stand-in that records daemon usage.
-
-    Used to simulate threading.Thread behavior for unit tests.
-    """
-
-    def __init__(self, target: Callable | None = None, daemon: bool | None = None):
-        """Initialise the dummy thread.
-
-        Args:
-            target (Callable | None): Callable that would normally run on the
-                thread. Stored for completeness so tests can assert it was set.
-            daemon (bool | None): Whether the thread should be a daemon. Tests
-                verify this flag is propagated from :class:`InletWorker`.
-        """
-        self.target = target
-        self.daemon = daemon
-        self.started = False
-        self.join_timeout = None
-
-    def start(self):
-        """Record that the thread would have been started."""
-        self.started = True
-
-    def join(self, timeout):
-        """Capture the timeout passed to ``Thread.join`` for assertions.
-
-        Args:
-            timeout (float): Timeout value passed to join.
-        """
-        self.join_timeout = timeout
-
-    def is_alive(self):
-        """Pretend the thread has already stopped.
-
-        Returns:
-            bool: Always False for dummy thread.
-        """
-        return False
-
-
-def test_start_raises_when_no_stream(monkeypatch):
+def test_start_raises_when_no_stream(monkeypatch, measure_module):
     """Ensure ``start`` raises when stream resolution finds nothing.
 
     Args:
         monkeypatch (pytest.MonkeyPatch): Test fixture that temporarily replaces
             :mod:`lsl_harness.measure` attributes.  It ensures the production
             module is untouched outside the scope of this test.
+        measure_module (types.ModuleType): The :mod:`lsl_harness.measure` module
+            under test.
     """
     # Explicitly patch the resolver to return an empty list so the failure path
     # is exercised deterministically.
-    monkeypatch.setattr(measure, "resolve_byprop", lambda *args, **kwargs: [])
+    monkeypatch.setattr(measure_module, "resolve_byprop", lambda *args, **kwargs: [])
 
-    worker = InletWorker(selector=("type", "EEG"))
+    worker = measure_module.InletWorker(selector=("type", "EEG"))
 
     with pytest.raises(RuntimeError, match="No LSL stream matching type==EEG"):
         worker.start()
@@ -108,7 +34,9 @@ def test_start_raises_when_no_stream(monkeypatch):
     assert worker._thread is None
 
 
-def test_start_uses_resolve_stream_on_typeerror(monkeypatch):
+def test_start_uses_resolve_stream_on_typeerror(
+    monkeypatch, measure_module, dummy_thread_cls
+):
     """Fallback to ``resolve_stream`` when ``resolve_byprop`` is too old.
 
     Args:
@@ -116,6 +44,10 @@ def test_start_uses_resolve_stream_on_typeerror(monkeypatch):
             so we can emulate an older pylsl release that lacks the ``timeout``
             keyword argument.  The dummy thread asserts the daemon flag is
             propagated as expected.
+        measure_module (types.ModuleType): The :mod:`lsl_harness.measure` module
+            under test.
+        dummy_thread_cls (type): Thread stand-in recording start and daemon
+            state.
     """
 
     def fake_resolve_byprop(*args, **kwargs):
@@ -135,31 +67,37 @@ def test_start_uses_resolve_stream_on_typeerror(monkeypatch):
             created["stream"] = stream
             created["kwargs"] = kwargs
 
-    monkeypatch.setattr(measure, "resolve_byprop", fake_resolve_byprop)
-    monkeypatch.setattr(measure, "resolve_stream", fake_resolve_stream)
-    monkeypatch.setattr(measure, "StreamInlet", DummyInlet)
-    monkeypatch.setattr(measure.threading, "Thread", DummyThread)
+    monkeypatch.setattr(measure_module, "resolve_byprop", fake_resolve_byprop)
+    monkeypatch.setattr(measure_module, "resolve_stream", fake_resolve_stream)
+    monkeypatch.setattr(measure_module, "StreamInlet", DummyInlet)
+    monkeypatch.setattr(measure_module.threading, "Thread", dummy_thread_cls)
 
-    worker = InletWorker(selector=("name", "Test"))
+    worker = measure_module.InletWorker(selector=("name", "Test"))
     worker.start()
 
     # Use constants from production code for StreamInlet kwargs
     expected_kwargs = {"max_buflen": 5, "max_chunklen": 0, "recover": True}
     assert created["stream"] == "stream"
     assert created["kwargs"] == expected_kwargs
-    assert isinstance(worker._thread, DummyThread)
+    assert isinstance(worker._thread, dummy_thread_cls)
     assert worker._thread.started is True
     # Background threads should be daemons so they do not block interpreter
     # shutdown in the real application.
     assert worker._thread.daemon is True
 
 
-def test_start_creates_inlet_when_stream_found(monkeypatch):
+def test_start_creates_inlet_when_stream_found(
+    monkeypatch, measure_module, dummy_thread_cls
+):
     """Create a ``StreamInlet`` and daemon thread when a stream is available.
 
     Args:
         monkeypatch (pytest.MonkeyPatch): Fixture that injects deterministic
             stub implementations of the pylsl functions used during start-up.
+        measure_module (types.ModuleType): The :mod:`lsl_harness.measure` module
+            under test.
+        dummy_thread_cls (type): Thread stand-in recording start and daemon
+            state.
     """
 
     def fake_resolve_byprop(key, value, timeout):
@@ -173,11 +111,11 @@ def test_start_creates_inlet_when_stream_found(monkeypatch):
             self.stream = stream
             self.kwargs = kwargs
 
-    monkeypatch.setattr(measure, "resolve_byprop", fake_resolve_byprop)
-    monkeypatch.setattr(measure, "StreamInlet", DummyInlet)
-    monkeypatch.setattr(measure.threading, "Thread", DummyThread)
+    monkeypatch.setattr(measure_module, "resolve_byprop", fake_resolve_byprop)
+    monkeypatch.setattr(measure_module, "StreamInlet", DummyInlet)
+    monkeypatch.setattr(measure_module.threading, "Thread", dummy_thread_cls)
 
-    worker = InletWorker()
+    worker = measure_module.InletWorker()
     worker.start()
 
     assert isinstance(worker.inlet, DummyInlet)
@@ -188,14 +126,16 @@ def test_start_creates_inlet_when_stream_found(monkeypatch):
     assert worker._thread.daemon is True
 
 
-def test_run_pushes_numpy_arrays(monkeypatch):
+def test_run_pushes_numpy_arrays(monkeypatch, measure_module):
     """Convert pulled chunks into numpy arrays before pushing to the ring.
 
     Args:
         monkeypatch (pytest.MonkeyPatch): Fixture that replaces ``local_clock``
             so we can assert the receive timestamp value deterministically.
+        measure_module (types.ModuleType): The :mod:`lsl_harness.measure` module
+            under test.
     """
-    worker = InletWorker()
+    worker = measure_module.InletWorker()
     worker._stop.clear()
 
     pushed = []
@@ -218,7 +158,7 @@ def test_run_pushes_numpy_arrays(monkeypatch):
     worker.ring = DummyRing()
     worker.inlet = DummyInlet()
 
-    monkeypatch.setattr(measure, "local_clock", lambda: 42.0)
+    monkeypatch.setattr(measure_module, "local_clock", lambda: 42.0)
 
     worker._run()
 
@@ -226,16 +166,61 @@ def test_run_pushes_numpy_arrays(monkeypatch):
     data, timestamps, recv = pushed[0]
     assert isinstance(data, np.ndarray)
     assert data.dtype == np.float32
-    assert data.tolist() == [[1.0, 2.0], [3.0, 4.0]]
+    np.testing.assert_array_equal(
+        data, np.array([[1.0, 2.0], [3.0, 4.0]], dtype=np.float32)
+    )
     assert isinstance(timestamps, np.ndarray)
     assert timestamps.dtype == np.float64
-    assert timestamps.tolist() == [0.1, 0.2]
+    np.testing.assert_array_equal(timestamps, np.array([0.1, 0.2], dtype=np.float64))
+    assert recv == 42.0
+
+
+def test_run_accepts_ndarray_chunk(monkeypatch, measure_module):
+    """Push arrays through untouched when the inlet already returns ndarrays.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Fixture that replaces ``local_clock``
+            with a deterministic value.
+        measure_module (types.ModuleType): The :mod:`lsl_harness.measure` module
+            under test.
+    """
+    worker = measure_module.InletWorker()
+    worker._stop.clear()
+
+    chunk_data = np.asarray([[1.0, 2.0], [3.0, 4.0]], dtype=np.float32)
+    chunk_timestamps = np.asarray([0.1, 0.2], dtype=np.float64)
+    pushed = []
+
+    class DummyRing:
+        """Collect values pushed by the worker for later assertions."""
+
+        def push(self, value):
+            pushed.append(value)
+            worker._stop.set()
+
+    class DummyInlet:
+        """Return a chunk that is already in the ring's array layout."""
+
+        def pull_chunk(self, max_samples, timeout):
+            return (chunk_data, chunk_timestamps)
+
+    worker.ring = DummyRing()
+    worker.inlet = DummyInlet()
+
+    monkeypatch.setattr(measure_module, "local_clock", lambda: 42.0)
+
+    worker._run()
+
+    assert len(pushed) == 1
+    data, timestamps, recv = pushed[0]
+    assert data is chunk_data
+    assert timestamps is chunk_timestamps
     assert recv == 42.0
 
 
-def test_stop_handles_inlet_and_thread():
+def test_stop_handles_inlet_and_thread(measure_module, dummy_thread_cls):
     """Warn when clean-up encounters recoverable errors."""
-    worker = InletWorker()
+    worker = measure_module.InletWorker()
 
     class DummyInlet:
         """Raise on ``close`` to exercise the warning path."""
@@ -243,7 +228,7 @@ def test_stop_handles_inlet_and_thread():
         def close(self):
             raise RuntimeError("boom")
 
-    class AliveThread(DummyThread):
+    class AliveThread(dummy_thread_cls):
         """Simulate a thread that remains alive after ``join`` completes."""
 
         def __init__(self):
@@ -258,13 +243,14 @@ def test_stop_handles_inlet_and_thread():
     worker._thread = AliveThread()
     thread = worker._thread
 
-    with pytest.warns(UserWarning) as record:
+    # The inner context re-emits warnings it does not match, so the outer one
+    # sees the inlet-close warning.
+    with (
+        pytest.warns(UserWarning, match="Exception occurred while closing inlet"),
+        pytest.warns(UserWarning, match="did not stop gracefully"),
+    ):
         worker.stop()
 
-    messages = [str(w.message) for w in record]
-    assert any("Exception occurred while closing inlet" in msg for msg in messages)
-    assert any("did not stop gracefully" in msg for msg in messages)
-
     assert worker.inlet is None
     assert worker._thread is None
     assert worker._stop.is_set()
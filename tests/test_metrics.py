@@ -5,19 +5,43 @@ It verifies latency percentiles, jitter, effective rate, drift, drop percent,
 ISI stats, sequence discontinuities, and receive-interval (R-R) metrics.
 """
 
+import functools
+
 import numpy as np
 import pytest
 
 from lsl_harness.metrics import compute_metrics
 
+# Shared read-only payload; chunks of up to 1000 samples use a view of it.
+_ZEROS_1000x1 = np.zeros((1000, 1), dtype=np.float32)
+_ZEROS_1000x1.setflags(write=False)
+
+# Least-squares slope of a 10 ms offset step halfway through n = 2000 samples
+# spaced dt = 1 ms: 15 * n / (dt * (n**2 - 1)) ms/s, times 60 for ms/min.
+_EXPECTED_STEP_DRIFT_MS_PER_MIN = 450.0001125000281
+
+# Receive times (s) and source timestamps for the one-sample-per-chunk RR test.
+_SINGLE_SAMPLE_RECEIVE_TIMES_S = (0.0, 0.1, 0.25, 0.45, 0.7, 1.0, 1.4, 1.9)
+_SINGLE_SAMPLE_TS_BLOCK = np.full((len(_SINGLE_SAMPLE_RECEIVE_TIMES_S), 1), 1000.0)
+_SINGLE_SAMPLE_TS_BLOCK.setflags(write=False)
+
+# Repeating 1/2/3 ms source intervals and their expected ISI statistics.
+_ISI_PATTERN_MS = np.tile([1.0, 2.0, 3.0], 1000)
+_ISI_PATTERN_MS.setflags(write=False)
+_ISI_PATTERN_MEAN_MS = float(np.mean(_ISI_PATTERN_MS))
+_ISI_PATTERN_STD_MS = float(np.std(_ISI_PATTERN_MS))
+_ISI_PATTERN_P50_MS, _ISI_PATTERN_P95_MS, _ISI_PATTERN_P99_MS = (
+    float(p) for p in np.percentile(_ISI_PATTERN_MS, [50, 95, 99])
+)
+
 
 def generate_synthetic_chunk(num_samples=1000):
-    """Yield a single synthetic chunk of LSL data for testing.
+    """Build a single synthetic chunk of LSL data for testing.
 
     Args:
         num_samples (int): Number of samples in the chunk.
 
-    Yields:
+    Returns:
         tuple: (data, timestamps, receive_time) where:
             data (np.ndarray): Array of zeros, shape (num_samples, 1), dtype float32.
             timestamps (np.ndarray): Source timestamps, evenly spaced, offset by 1000.0.
@@ -25,15 +49,42 @@ def generate_synthetic_chunk(num_samples=1000):
     """
     timestamps = np.linspace(0, 1, num_samples, endpoint=False) + 1000.0
     receive_times = timestamps + 0.005
-    yield (np.zeros((num_samples, 1), dtype=np.float32), timestamps, receive_times[-1])
+    return (np.zeros((num_samples, 1), dtype=np.float32), timestamps, receive_times[-1])
+
 
+@pytest.fixture(scope="module")
+def uniform_1000hz_chunk():
+    """Build the default synthetic 1000 Hz chunk once per module.
 
-def test_metrics_basic():
+    Returns:
+        tuple: ``(data, timestamps, receive_time)`` from
+        :func:`generate_synthetic_chunk`.
+    """
+    return generate_synthetic_chunk()
+
+
+@pytest.fixture(scope="module")
+def basic_summary(uniform_1000hz_chunk):
+    """Compute metrics for the default synthetic chunk once per module.
+
+    Args:
+        uniform_1000hz_chunk (tuple): Chunk built by the fixture of that name.
+
+    Returns:
+        Summary: Metrics for the uniform 1000 Hz chunk with no drops.
+    """
+    return compute_metrics([uniform_1000hz_chunk], 1000.0, ring_drops=0)
+
+
+def test_metrics_basic(basic_summary):
     """Test compute_metrics with a basic synthetic chunk.
 
     Verifies latency, drop percentage, ISI mean/std, and max latency behavior.
+
+    Args:
+        basic_summary (Summary): Metrics for the default synthetic chunk.
     """
-    summary = compute_metrics(list(generate_synthetic_chunk()), 1000.0, ring_drops=0)
+    summary = basic_summary
     assert 4.0 <= summary.p50_ms <= 6.0
     assert summary.drops_percentage == 0.0
     # ISI should be close to 1 ms for 1000 Hz, stddev near zero
@@ -58,7 +109,7 @@ def test_max_latency_outlier():
     receive_times = timestamps + 0.005
     receive_times[-1] = timestamps[-1] + 0.1  # Outlier for last sample
     chunk = (
-        np.zeros((num_samples, 1), dtype=np.float32),
+        _ZEROS_1000x1,
         timestamps,
         receive_times[-1],
     )
@@ -79,84 +130,122 @@ def make_chunk(
     dt = 1.0 / sample_rate_hz
     timestamps = start_time_s + np.arange(num_samples, dtype=np.float64) * dt
     receive_time = float(timestamps[-1] + latency_ms / 1000.0)
-    data = np.zeros((num_samples, 1), dtype=np.float32)
+    if num_samples <= len(_ZEROS_1000x1):
+        data = _ZEROS_1000x1[:num_samples]
+    else:
+        data = np.zeros((num_samples, 1), dtype=np.float32)
     return (data, timestamps, receive_time)
 
 
-def test_percentiles_and_jitter():
-    """Verify p50/p95/p99 and jitter from mixed-latency chunks."""
+@pytest.fixture(scope="session")
+def chunk_factory():
+    """Provide a memoized, read-only variant of :func:`make_chunk`.
+
+    Returns:
+        Callable: Takes the :func:`make_chunk` arguments positionally and
+        returns a cached chunk whose arrays are marked read-only, so sharing it
+        between tests cannot leak mutations.
+    """
+
+    @functools.lru_cache(maxsize=64)
+    def build(num_samples, start_time_s, sample_rate_hz, latency_ms):
+        data, timestamps, receive_time = make_chunk(
+            num_samples, start_time_s, sample_rate_hz, latency_ms
+        )
+        data.setflags(write=False)
+        timestamps.setflags(write=False)
+        return (data, timestamps, receive_time)
+
+    return build
+
+
+@pytest.fixture(scope="module")
+def cm_cached(chunk_factory):
+    """Provide :func:`compute_metrics` memoized on chunk descriptors.
+
+    Args:
+        chunk_factory (Callable): Session-wide memoized chunk builder.
+
+    Returns:
+        Callable: Takes ``(chunk_specs, nominal_rate, ring_drops)`` where
+        ``chunk_specs`` is a tuple of :func:`make_chunk` argument tuples, and
+        returns the cached summary for those chunks.
+    """
+
+    @functools.cache
+    def run(chunk_specs, nominal_rate, ring_drops):
+        chunks = [chunk_factory(*spec) for spec in chunk_specs]
+        return compute_metrics(chunks, nominal_rate=nominal_rate, ring_drops=ring_drops)
+
+    return run
+
+
+# Two-chunk 1000 Hz datasets as ``(chunk_specs, nominal_rate, ring_drops)``.
+_TWO_CHUNK_DATASETS = {
     # 900 samples at 5 ms, 100 samples at 20 ms
-    chunk_5ms = make_chunk(900, 0.0, 1000.0, 5.0)
-    chunk_20ms = make_chunk(100, 0.9, 1000.0, 20.0)
-    summary = compute_metrics(
-        [chunk_5ms, chunk_20ms], nominal_rate=1000.0, ring_drops=0
-    )
-    assert 4.9 <= summary.p50_ms <= 5.1
-    assert 19.9 <= summary.p95_ms <= 20.1
-    assert 19.9 <= summary.p99_ms <= 20.1
-    assert 14.8 <= summary.jitter_ms <= 15.2
-    # jitter_std equals std of a vector with 900x5 and 100x20
-    latencies = np.array([5.0] * 900 + [20.0] * 100, dtype=np.float64)
-    expected_std = float(np.std(latencies))
-    assert abs(summary.jitter_std - expected_std) < 1e-9
-
-
-def test_effective_sample_rate_and_total_count():
-    """Check effective sample rate calculation and total sample count."""
-    chunk_750 = make_chunk(750, 0.0, 1000.0, 5.0)
-    chunk_250 = make_chunk(250, 0.75, 1000.0, 5.0)
-    chunks = [chunk_750, chunk_250]
-    summary = compute_metrics(chunks, nominal_rate=1000.0, ring_drops=3)
-    # Total count is exact
-    assert summary.total_sample_count == 1000
-    assert summary.ring_drops == 3
-    # Compute expected effective rate using same formula
-    all_timestamps = np.concatenate([chunk_750[1], chunk_250[1]])
-    duration = float(all_timestamps[-1] - all_timestamps[0])
-    expected_rate = 1000 / max(duration, 1e-6)
-    assert abs(summary.effective_sample_rate_hz - expected_rate) < 1e-9
-
-
-def test_drift_ms_per_min_least_squares():
-    """Validate drift using the same least-squares method as implementation."""
+    "mixed-latency": (((900, 0.0, 1000.0, 5.0), (100, 0.9, 1000.0, 20.0)), 1000.0, 0),
+    # 1000 contiguous samples split 750/250, with ring drops reported
+    "split-with-drops": (
+        ((750, 0.0, 1000.0, 5.0), (250, 0.75, 1000.0, 5.0)),
+        1000.0,
+        3,
+    ),
     # First second at 5 ms, second second at 15 ms latency
-    chunk_5ms = make_chunk(1000, 0.0, 1000.0, 5.0)
-    chunk_15ms = make_chunk(1000, 1.0, 1000.0, 15.0)
-    summary = compute_metrics(
-        [chunk_5ms, chunk_15ms], nominal_rate=1000.0, ring_drops=0
-    )
-    # Recompute expected slope using the exact algorithm
-    all_timestamps = np.concatenate([chunk_5ms[1], chunk_15ms[1]])
-    recv_last_offsets = np.array([5.0] * 1000 + [15.0] * 1000) / 1000.0
-    # Per-sample recv = ts_i + const_offset for each chunk -> offsets constant
-    offset_ms = recv_last_offsets * 1000.0
-    t_norm = all_timestamps - all_timestamps[0]
-    regression_matrix = np.vstack([t_norm, np.ones_like(t_norm)]).T
-    slope_ms_per_s, _ = np.linalg.lstsq(regression_matrix, offset_ms, rcond=None)[0]
-    expected_drift = float(slope_ms_per_s * 60.0)
-    assert abs(summary.drift_ms_per_min - expected_drift) < 1e-9
-
-
-def test_drop_percentage():
-    """Check drop percentage against expected for under-sampled stream."""
-    # Build 1500 samples over ~2 seconds at 1000 Hz -> ~25% drop vs nominal
-    chunk_1000 = make_chunk(1000, 0.0, 1000.0, 5.0)
-    chunk_500 = make_chunk(500, 1.0, 1000.0, 5.0)
-    chunks = [chunk_1000, chunk_500]
-    summary = compute_metrics(chunks, nominal_rate=1000.0, ring_drops=0)
-    all_timestamps = np.concatenate([chunk_1000[1], chunk_500[1]])
-    duration = float(all_timestamps[-1] - all_timestamps[0])
-    expected_drop_pct = 100.0 * max(
-        0.0,
-        (1000.0 * duration - 1500) / max(1000.0 * duration, 1.0),
-    )
-    assert abs(summary.drops_percentage - expected_drop_pct) < 1e-9
+    "latency-step": (((1000, 0.0, 1000.0, 5.0), (1000, 1.0, 1000.0, 15.0)), 1000.0, 0),
+    # 1000 + 500 samples with a 0.5 s gap: the span is 1.999 s, so 499 of
+    # the 1999 nominally expected samples are missing
+    "gap-500ms": (
+        ((1000, 0.0, 1000.0, 5.0), (500, 1.5, 1000.0, 5.0)),
+        1000.0,
+        0,
+    ),
+}
+
+
+@pytest.mark.parametrize(
+    ("dataset", "field", "expected"),
+    [
+        ("mixed-latency", "p50_ms", pytest.approx(5.0, abs=0.1)),
+        ("mixed-latency", "p95_ms", pytest.approx(20.0, abs=0.1)),
+        ("mixed-latency", "p99_ms", pytest.approx(20.0, abs=0.1)),
+        ("mixed-latency", "jitter_ms", pytest.approx(15.0, abs=0.2)),
+        # std of 900x5 and 100x20: sqrt(0.9 * 0.1) * (20 - 5) = 4.5 exactly.
+        ("mixed-latency", "jitter_std", pytest.approx(4.5, abs=1e-9)),
+        ("split-with-drops", "total_sample_count", 1000),
+        ("split-with-drops", "ring_drops", 3),
+        # 1000 samples over a 0.999 s span
+        (
+            "split-with-drops",
+            "effective_sample_rate_hz",
+            pytest.approx(1000 / 0.999, rel=1e-12),
+        ),
+        (
+            "latency-step",
+            "drift_ms_per_min",
+            pytest.approx(_EXPECTED_STEP_DRIFT_MS_PER_MIN, abs=1e-9),
+        ),
+        ("gap-500ms", "drops_percentage", pytest.approx(499 / 1999 * 100, rel=1e-9)),
+    ],
+)
+def test_two_chunk_summary_fields(cm_cached, dataset, field, expected):
+    """Check one summary field of a cached two-chunk dataset.
+
+    Each dataset is run through compute_metrics once per module; every
+    parameter then asserts a single field against its closed-form value.
+
+    Args:
+        cm_cached (Callable): Memoized compute_metrics keyed by chunk specs.
+        dataset (str): Key into ``_TWO_CHUNK_DATASETS``.
+        field (str): Summary attribute to check.
+        expected (object): Expected value, possibly a ``pytest.approx``.
+    """
+    summary = cm_cached(*_TWO_CHUNK_DATASETS[dataset])
+    assert getattr(summary, field) == expected
 
 
-def test_isi_statistics():
+def test_isi_statistics(cm_cached):
     """ISI stats should match a perfectly uniform 1000 Hz source."""
-    chunk_uniform = make_chunk(2000, 0.0, 1000.0, 5.0)
-    summary = compute_metrics([chunk_uniform], nominal_rate=1000.0, ring_drops=0)
+    summary = cm_cached(((2000, 0.0, 1000.0, 5.0),), 1000.0, 0)
     assert abs(summary.isi_mean_ms - 1.0) < 1e-12
     assert summary.isi_std_ms < 1e-12
     assert abs(summary.isi_p50_ms - 1.0) < 1e-12
@@ -164,12 +253,12 @@ def test_isi_statistics():
     assert abs(summary.isi_p99_ms - 1.0) < 1e-12
 
 
-def test_sequence_discontinuities_and_rr_stats():
+def test_sequence_discontinuities_and_rr_stats(chunk_factory):
     """Count out-of-order chunk and verify R-R mean/std in ms."""
     # Two chunks where the second starts earlier than the end of the first
-    chunk_early = make_chunk(1000, 0.0, 1000.0, 5.0)
-    chunk_overlap = make_chunk(500, 0.9, 1000.0, 10.0)
-    chunk_late = make_chunk(500, 1.6, 1000.0, 10.0)
+    chunk_early = chunk_factory(1000, 0.0, 1000.0, 5.0)
+    chunk_overlap = chunk_factory(500, 0.9, 1000.0, 10.0)
+    chunk_late = chunk_factory(500, 1.6, 1000.0, 10.0)
     # Set explicit receive times to control R-R: 10.00s, 10.05s, 10.12s
     chunk_early = (chunk_early[0], chunk_early[1], 10.00)
     chunk_overlap = (chunk_overlap[0], chunk_overlap[1], 10.05)
@@ -184,7 +273,7 @@ def test_sequence_discontinuities_and_rr_stats():
     assert abs(summary.rr_std_ms - 10.0) < 2e-12
 
 
-def test_rr_warning_and_zero_values(recwarn):
+def test_rr_warning_and_zero_values(recwarn, chunk_factory):
     """With one or zero chunks, RR stats should be zero and warn."""
     # Ensure this test sees the warning, overriding global ignore
     import warnings
@@ -195,16 +284,16 @@ def test_rr_warning_and_zero_values(recwarn):
         category=UserWarning,
         module=r"lsl_harness\.metrics",
     )
-    chunk = make_chunk(1000, 0.0, 1000.0, 5.0)
+    chunk = chunk_factory(1000, 0.0, 1000.0, 5.0)
     with pytest.warns(UserWarning, match="R-R interval statistics will be zero"):
         summary = compute_metrics([chunk], nominal_rate=1000.0, ring_drops=0)
     assert summary.rr_mean_ms == 0.0
     assert summary.rr_std_ms == 0.0
 
 
-def test_raises_value_error_for_small_sample_count():
+def test_raises_value_error_for_small_sample_count(chunk_factory):
     """Total samples < 8 should raise ValueError."""
-    chunk = make_chunk(7, 0.0, 1000.0, 5.0)
+    chunk = chunk_factory(7, 0.0, 1000.0, 5.0)
     with pytest.raises(ValueError):
         compute_metrics([chunk], nominal_rate=1000.0, ring_drops=0)
 
@@ -214,7 +303,7 @@ def test_zero_duration_guard_and_rate():
     # Create a chunk where all timestamps are identical
     num_samples = 100
     timestamps = np.array([1000.0] * num_samples, dtype=np.float64)
-    data = np.zeros((num_samples, 1), dtype=np.float32)
+    data = _ZEROS_1000x1[:num_samples]
     receive_time = float(timestamps[-1] + 0.005)
     chunk = (data, timestamps, receive_time)
     summary = compute_metrics([chunk], nominal_rate=1000.0, ring_drops=0)
@@ -228,54 +317,50 @@ def test_zero_duration_guard_and_rate():
 def test_non_uniform_isi_statistics():
     """ISI stats reflect variable interval sequence."""
     # Manually craft non-uniform source intervals: 1ms,2ms,3ms repeating
-    intervals_ms = np.array([1.0, 2.0, 3.0] * 1000, dtype=np.float64)
-    intervals_s = intervals_ms / 1000.0
-    timestamps = 1000.0 + np.cumsum(np.concatenate([[0.0], intervals_s]))
+    timestamps = np.empty(len(_ISI_PATTERN_MS) + 1, dtype=np.float64)
+    timestamps[0] = 1000.0
+    np.cumsum(_ISI_PATTERN_MS / 1000.0, out=timestamps[1:])
+    timestamps[1:] += 1000.0
     data = np.zeros((len(timestamps), 1), dtype=np.float32)
     receive_time = float(timestamps[-1] + 0.005)
     chunk = (data, timestamps, receive_time)
     summary = compute_metrics([chunk], nominal_rate=1000.0, ring_drops=0)
-    assert abs(summary.isi_mean_ms - float(np.mean(intervals_ms))) < 1e-12
-    assert abs(summary.isi_std_ms - float(np.std(intervals_ms))) < 1e-10
-    p50, p95, p99 = np.percentile(intervals_ms, [50, 95, 99])
-    assert abs(summary.isi_p50_ms - float(p50)) < 1e-10
-    assert abs(summary.isi_p95_ms - float(p95)) < 1e-10
-    assert abs(summary.isi_p99_ms - float(p99)) < 1e-10
+    assert abs(summary.isi_mean_ms - _ISI_PATTERN_MEAN_MS) < 1e-12
+    assert abs(summary.isi_std_ms - _ISI_PATTERN_STD_MS) < 1e-10
+    assert abs(summary.isi_p50_ms - _ISI_PATTERN_P50_MS) < 1e-10
+    assert abs(summary.isi_p95_ms - _ISI_PATTERN_P95_MS) < 1e-10
+    assert abs(summary.isi_p99_ms - _ISI_PATTERN_P99_MS) < 1e-10
 
 
-def test_negative_drift():
+def test_negative_drift(cm_cached):
     """Drift goes negative when latency decreases over time."""
-    chunk_high_latency = make_chunk(1000, 0.0, 1000.0, 20.0)
-    chunk_low_latency = make_chunk(1000, 1.0, 1000.0, 5.0)
-    summary = compute_metrics(
-        [chunk_high_latency, chunk_low_latency],
-        nominal_rate=1000.0,
-        ring_drops=0,
+    # High latency first, then low latency
+    summary = cm_cached(
+        ((1000, 0.0, 1000.0, 20.0), (1000, 1.0, 1000.0, 5.0)), 1000.0, 0
     )
     assert summary.drift_ms_per_min < 0.0
 
 
 def test_rr_stats_many_single_sample_chunks():
     """RR mean/std computed correctly across many 1-sample chunks."""
-    # Build 8 one-sample chunks with receive times at specified intervals
-    timestamp_value = 1000.0
-    receive_times_s = [0.0, 0.1, 0.25, 0.45, 0.7, 1.0, 1.4, 1.9]
-    single_sample_chunks = []
-    for receive_time in receive_times_s:
-        data = np.zeros((1, 1), dtype=np.float32)
-        timestamps = np.array([timestamp_value], dtype=np.float64)
-        single_sample_chunks.append((data, timestamps, receive_time))
+    # Eight one-sample chunks, each a view into the shared read-only blocks
+    single_sample_chunks = [
+        (_ZEROS_1000x1[i : i + 1], _SINGLE_SAMPLE_TS_BLOCK[i], receive_time)
+        for i, receive_time in enumerate(_SINGLE_SAMPLE_RECEIVE_TIMES_S)
+    ]
     summary = compute_metrics(single_sample_chunks, nominal_rate=1000.0, ring_drops=0)
-    rr_intervals_ms = np.diff(np.array(receive_times_s)) * 1000.0
+    rr_intervals_ms = np.diff(_SINGLE_SAMPLE_RECEIVE_TIMES_S) * 1000.0
     assert abs(summary.rr_mean_ms - float(np.mean(rr_intervals_ms))) < 1e-12
     assert abs(summary.rr_std_ms - float(np.std(rr_intervals_ms))) < 1e-12
+    # Every source timestamp is 1000.0, so there is no time axis for drift.
+    assert summary.drift_ms_per_min == 0.0
 
 
-def test_sequence_equal_boundary_no_discontinuity():
+def test_sequence_equal_boundary_no_discontinuity(chunk_factory):
     """If chunk2 starts exactly at last ts of chunk1, no discontinuity."""
     # chunk1 ends at t=1.0, chunk2 starts at exactly 1.0
-    chunk1 = make_chunk(1000, 0.0, 1000.0, 5.0)
-    chunk2 = make_chunk(500, 1.0, 1000.0, 10.0)
+    chunk1 = chunk_factory(1000, 0.0, 1000.0, 5.0)
+    chunk2 = chunk_factory(500, 1.0, 1000.0, 10.0)
     chunk1 = (chunk1[0], chunk1[1], 10.00)
     chunk2 = (chunk2[0], chunk2[1], 10.05)
     summary = compute_metrics([chunk1, chunk2], nominal_rate=1000.0, ring_drops=0)
@@ -1,82 +1,47 @@
 """Tests for HTML report generation."""
 
-import csv
-import json
-from unittest.mock import patch
+import base64
+import re
 
+import numpy as np
 import pytest
 
 from lsl_harness.report import (
+    DRIFT_PLOT_MAX_POINTS,
     LATENCY_CSV_FILE,
+    LATENCY_NPY_FILE,
     SUMMARY_JSON_FILE,
     TIMES_CSV_FILE,
+    TIMES_NPY_FILE,
     render_html_report,
 )
 
 
 @pytest.fixture
-def run_directory(tmp_path):
-    """Fixture to create a dummy run directory with necessary files."""
-    run_dir = tmp_path / "test_run"
-    run_dir.mkdir()
-
-    summary_data = {
-        "p50_ms": 10.0,
-        "p95_ms": 20.0,
-        "p99_ms": 30.0,
-        "max_latency_ms": 40.0,
-        "jitter_ms": 10.0,
-        "jitter_std": 2.0,
-        "effective_sample_rate_hz": 1000.0,
-        "drops_percentage": 5.0,
-        "total_sample_count": 100,
-        "ring_drops": 5,
-        "isi_mean_ms": 1.0,
-        "isi_std_ms": 0.1,
-        "isi_p50_ms": 1.0,
-        "isi_p95_ms": 1.1,
-        "isi_p99_ms": 1.2,
-        "rr_mean_ms": 10.0,
-        "rr_std_ms": 0.5,
-        "drift_ms_per_min": 1.0,
-        "sequence_discontinuities": 1,
-        "process_cpu_percent_avg": None,
-        "process_rss_avg_bytes": None,
-        "system_cpu_percent_avg": None,
-        "system_cpu_percent_per_core_avg": [],
-        "parameters": {
-            "selector": {"key": "type", "value": "EEG"},
-            "duration_seconds": 10,
-            "chunk_size": 32,
-            "nominal_sample_rate": 1000,
-        },
-        "environment": {
-            "python": "3.11",
-            "platform": "linux",
-            "pylsl_version": "1.16.2",
-        },
-    }
-    (run_dir / SUMMARY_JSON_FILE).write_text(json.dumps(summary_data))
-
-    with open(run_dir / LATENCY_CSV_FILE, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["latency_ms"])
-        writer.writerow([10.0])
-        writer.writerow([20.0])
-
-    return run_dir
-
-
-def test_render_html_report_success(run_directory):
+def savefig_calls(monkeypatch):
+    """Replace ``Figure.savefig`` with a recorder so no figure is rasterized.
+
+    Returns:
+        list[Path]: Output paths passed to ``savefig``, in call order.
+    """
+    from matplotlib.figure import Figure
+
+    calls = []
+    monkeypatch.setattr(
+        Figure, "savefig", lambda self, fname, **kwargs: calls.append(fname)
+    )
+    return calls
+
+
+def test_render_html_report_success(run_directory, savefig_calls):
     """Test successful generation of the HTML report."""
-    with patch("lsl_harness.report.plt.savefig") as mock_savefig:
-        render_html_report(run_directory)
+    render_html_report(run_directory, inline_images=False)
 
     report_path = run_directory / "report.html"
     assert report_path.exists()
 
     # Should be called once for latency histogram
-    assert mock_savefig.call_count == 1
+    assert savefig_calls == [run_directory / "latency_hist.png"]
 
     with open(report_path) as f:
         content = f.read()
@@ -85,23 +50,23 @@ def test_render_html_report_success(run_directory):
     assert "<td>10.0 ms</td>" in content  # p50_ms
 
 
-def test_render_html_report_with_drift_plot(run_directory):
+def test_render_html_report_with_drift_plot(run_directory, savefig_calls):
     """Test report generation with the drift plot."""
     # Add times.csv to the run directory
-    with open(run_directory / TIMES_CSV_FILE, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["src_time", "recv_time"])
-        writer.writerow([1000.0, 1000.01])
-        writer.writerow([1001.0, 1001.02])
+    (run_directory / TIMES_CSV_FILE).write_text(
+        "src_time,recv_time\n1000.0,1000.01\n1001.0,1001.02\n"
+    )
 
-    with patch("lsl_harness.report.plt.savefig") as mock_savefig:
-        render_html_report(run_directory)
+    render_html_report(run_directory, inline_images=False)
 
     report_path = run_directory / "report.html"
     assert report_path.exists()
 
     # Should be called twice: latency hist and drift plot
-    assert mock_savefig.call_count == 2
+    assert savefig_calls == [
+        run_directory / "latency_hist.png",
+        run_directory / "drift_plot.png",
+    ]
 
     with open(report_path) as f:
         content = f.read()
@@ -109,6 +74,53 @@ def test_render_html_report_with_drift_plot(run_directory):
     assert 'src="drift_plot.png"' in content
 
 
+def test_render_html_report_prefers_npy_artifacts(run_directory, savefig_calls):
+    """The .npy artifacts are read in place of the CSVs when present."""
+    (run_directory / LATENCY_CSV_FILE).unlink()
+    np.save(run_directory / LATENCY_NPY_FILE, np.array([10.0, 20.0], np.float32))
+    np.save(run_directory / TIMES_NPY_FILE, np.array([[1000.0, 1000.01]]))
+
+    render_html_report(run_directory, inline_images=False)
+
+    assert savefig_calls == [
+        run_directory / "latency_hist.png",
+        run_directory / "drift_plot.png",
+    ]
+    assert 'src="drift_plot.png"' in (run_directory / "report.html").read_text()
+
+
+def test_drift_plot_is_downsampled(run_directory, savefig_calls):
+    """Long runs are strided to at most DRIFT_PLOT_MAX_POINTS plotted points."""
+    from lsl_harness.report import _plot_canvas
+
+    source_times = np.arange(5 * DRIFT_PLOT_MAX_POINTS + 1, dtype=np.float64)
+    times_rows = np.column_stack((source_times, source_times + 0.002))
+    np.save(run_directory / TIMES_NPY_FILE, times_rows)
+
+    render_html_report(run_directory)
+
+    (line,) = _plot_canvas()[1].lines
+    assert len(line.get_xdata()) <= DRIFT_PLOT_MAX_POINTS
+    assert line.get_xdata()[0] == 0.0
+    np.testing.assert_allclose(line.get_ydata(), 2.0)
+
+
+def test_render_html_report_inlines_plots(run_directory):
+    """By default the plots are embedded as PNG data URLs, not written to disk."""
+    (run_directory / TIMES_CSV_FILE).write_text(
+        "src_time,recv_time\n1000.0,1000.01\n1001.0,1001.02\n"
+    )
+
+    render_html_report(run_directory)
+
+    content = (run_directory / "report.html").read_text()
+    data_urls = re.findall(r'src="data:image/png;base64,([^"]+)"', content)
+    assert len(data_urls) == 2
+    assert all(base64.b64decode(url).startswith(b"\x89PNG") for url in data_urls)
+    assert not (run_directory / "latency_hist.png").exists()
+    assert not (run_directory / "drift_plot.png").exists()
+
+
 def test_render_html_report_missing_summary(run_directory):
     """Test error handling when summary.json is missing."""
     (run_directory / SUMMARY_JSON_FILE).unlink()
@@ -119,5 +131,5 @@ def test_render_html_report_missing_summary(run_directory):
 def test_render_html_report_missing_latency_csv(run_directory):
     """Test error handling when latency.csv is missing."""
     (run_directory / LATENCY_CSV_FILE).unlink()
-    with pytest.raises(FileNotFoundError):
+    with pytest.raises(FileNotFoundError, match=r"latency\.npy or .*latency\.csv"):
         render_html_report(run_directory)
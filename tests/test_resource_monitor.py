@@ -3,8 +3,13 @@
 Includes unit tests for ResourceMonitor using fake psutil/process/clock classes.
 """
 
+import itertools
+import time
+from collections.abc import Iterable
+
 import pytest
 
+from lsl_harness import resource_monitor
 from lsl_harness.resource_monitor import ResourceMonitor
 
 
@@ -19,11 +24,13 @@ class _FakeProcess:
     """Fake process object to mimic psutil.Process().
 
     Args:
-        cpu_values (list[float]): Sequence of CPU percent values to yield.
-        rss_values (list[float]): Sequence of RSS values to yield.
+        cpu_values (Iterable[float]): Sequence of CPU percent values to yield.
+        rss_values (Iterable[float]): Sequence of RSS values to yield.
     """
 
-    def __init__(self, cpu_values: list[float], rss_values: list[float]) -> None:
+    def __init__(
+        self, cpu_values: Iterable[float], rss_values: Iterable[float]
+    ) -> None:
         self._cpu_values = iter(cpu_values)
         self._rss_values = iter(rss_values)
 
@@ -40,10 +47,10 @@ class _FakePsutil:
     """Fake psutil module to inject into ResourceMonitor for testing.
 
     Args:
-        per_core_samples (list[list[float]]): List of per-core CPU percent samples.
+        per_core_samples (Iterable[list[float]]): Per-core CPU percent samples.
     """
 
-    def __init__(self, per_core_samples: list[list[float]]) -> None:
+    def __init__(self, per_core_samples: Iterable[list[float]]) -> None:
         self._process = _FakeProcess(
             cpu_values=[0.0, 10.0, 20.0, 30.0],
             rss_values=[100.0, 200.0, 300.0],
@@ -62,18 +69,18 @@ class _FakePsutil:
 
 
 class _FakeClock:
-    """Fake monotonic clock for deterministic time advancement in tests."""
+    """Fake integer-nanosecond monotonic clock for deterministic tests."""
 
     def __init__(self) -> None:
-        self.value = 0.0
+        self.value = 0
 
-    def advance(self, delta: float) -> float:
-        """Advance the clock by delta seconds and return the new value."""
-        self.value += delta
+    def advance(self, delta: float) -> int:
+        """Advance the clock by delta seconds and return the new value in ns."""
+        self.value += round(delta * 1e9)
         return self.value
 
-    def __call__(self) -> float:  # pragma: no cover - trivial
-        """Return the current clock value."""
+    def __call__(self) -> int:  # pragma: no cover - trivial
+        """Return the current clock value in nanoseconds."""
         return self.value
 
 
@@ -89,14 +96,14 @@ def test_resource_monitor_collects_and_averages():
     monitor = ResourceMonitor(
         sample_interval_seconds=0.5,
         psutil_module=_FakePsutil(per_core_samples),
-        monotonic_fn=clock,
+        monotonic_ns_fn=clock,
     )
 
     # First maybe_sample should not sample (interval not elapsed)
-    assert not monitor.maybe_sample(now=clock.advance(0.2))
+    assert not monitor.maybe_sample(now_ns=clock.advance(0.2))
     # Next two exceed interval
-    assert monitor.maybe_sample(now=clock.advance(0.4))
-    assert monitor.maybe_sample(now=clock.advance(0.6))
+    assert monitor.maybe_sample(now_ns=clock.advance(0.4))
+    assert monitor.maybe_sample(now_ns=clock.advance(0.6))
     # Finalize after advancing again
     clock.advance(0.5)
     monitor.finalize()
@@ -116,6 +123,31 @@ def test_resource_monitor_collects_and_averages():
     )
     assert usage.system_cpu_percent_per_core_avg[0] == pytest.approx(expected_core0)
     assert usage.system_cpu_percent_per_core_avg[1] == pytest.approx(expected_core1)
+    assert usage.per_core_array.tolist() == pytest.approx(
+        [expected_core0, expected_core1]
+    )
+
+
+def test_maybe_sample_at_uses_caller_timestamp():
+    """maybe_sample_at honours the supplied timestamp without reading the clock."""
+
+    def _unexpected_clock_read() -> int:
+        raise AssertionError("maybe_sample_at must not read the clock")
+
+    monitor = ResourceMonitor(
+        sample_interval_seconds=0.5,
+        psutil_module=_FakePsutil([[0.0, 0.0], [40.0, 60.0]]),
+        monotonic_ns_fn=lambda: 0,
+    )
+    monitor._monotonic = _unexpected_clock_read
+
+    assert not monitor.maybe_sample_at(300_000_000)
+    assert monitor.maybe_sample_at(600_000_000)
+
+    usage = monitor.snapshot()
+    assert usage is not None
+    assert usage.process_cpu_percent_avg == pytest.approx(10.0)
+    assert usage.system_cpu_percent_per_core_avg == pytest.approx((40.0, 60.0))
 
 
 def test_snapshot_none_when_no_samples():
@@ -124,7 +156,7 @@ def test_snapshot_none_when_no_samples():
     monitor = ResourceMonitor(
         sample_interval_seconds=0.5,
         psutil_module=_FakePsutil([[0.0, 0.0]]),
-        monotonic_fn=clock,
+        monotonic_ns_fn=clock,
     )
     # No sampling performed
     assert monitor.snapshot() is None
@@ -133,6 +165,95 @@ def test_snapshot_none_when_no_samples():
 def test_fake_clock_call_returns_value():
     """_FakeClock.__call__ returns the current clock value."""
     clock = _FakeClock()
-    assert clock() == 0.0
+    assert clock() == 0
     clock.advance(1.5)
-    assert clock() == 1.5
+    assert clock() == 1_500_000_000
+
+
+def test_long_runs_average_every_sample():
+    """Running sums average every sample of a long run."""
+    sample_count = 200
+    fake_psutil = _FakePsutil([[0.0, 0.0]] + [[10.0, 30.0]] * sample_count)
+    fake_psutil._process = _FakeProcess(
+        cpu_values=[0.0, *range(sample_count)],
+        rss_values=[1000.0] * sample_count,
+    )
+    monitor = ResourceMonitor(psutil_module=fake_psutil, monotonic_ns_fn=lambda: 0)
+
+    for _ in range(sample_count):
+        monitor.finalize()
+
+    usage = monitor.snapshot()
+    assert usage is not None
+    assert usage.process_cpu_percent_avg == pytest.approx((sample_count - 1) / 2.0)
+    assert usage.process_rss_avg_bytes == pytest.approx(1000.0)
+    assert usage.system_cpu_percent_per_core_avg == pytest.approx((10.0, 30.0))
+    assert usage.system_cpu_percent_avg == pytest.approx(20.0)
+
+
+def test_start_runs_daemon_sampler_joined_by_finalize(monkeypatch, dummy_thread_cls):
+    """start() spawns one daemon sampler thread that finalize() stops and joins.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Fixture used to swap in the thread class.
+        dummy_thread_cls (type): Thread stand-in that records start/join calls.
+    """
+    monkeypatch.setattr(resource_monitor.threading, "Thread", dummy_thread_cls)
+    monitor = ResourceMonitor(
+        psutil_module=_FakePsutil([[0.0, 0.0], [40.0, 60.0]]),
+        monotonic_ns_fn=lambda: 0,
+    )
+
+    monitor.start()
+    thread = monitor._thread
+    monitor.start()
+
+    assert monitor._thread is thread
+    assert thread.started and thread.daemon
+    assert thread.target == monitor._run
+
+    monitor.finalize()
+
+    assert monitor._stop.is_set()
+    assert thread.join_timeout == ResourceMonitor._JOIN_TIMEOUT
+    assert monitor._thread is None
+    usage = monitor.snapshot()
+    assert usage is not None
+    assert usage.system_cpu_percent_per_core_avg == pytest.approx((40.0, 60.0))
+
+
+def test_background_sampler_records_samples():
+    """The background thread keeps sampling until finalize() stops it."""
+    fake_psutil = _FakePsutil(itertools.repeat([40.0, 60.0]))
+    fake_psutil._process = _FakeProcess(
+        cpu_values=itertools.repeat(25.0), rss_values=itertools.repeat(512.0)
+    )
+    monitor = ResourceMonitor(sample_interval_seconds=0.001, psutil_module=fake_psutil)
+
+    monitor.start()
+    deadline = time.monotonic() + 5.0
+    while monitor.snapshot() is None and time.monotonic() < deadline:
+        time.sleep(0.001)
+    monitor.finalize()
+
+    assert monitor._sample_count >= 2
+    usage = monitor.snapshot()
+    assert usage is not None
+    assert usage.process_cpu_percent_avg == pytest.approx(25.0)
+    assert usage.process_rss_avg_bytes == pytest.approx(512.0)
+    assert usage.system_cpu_percent_avg == pytest.approx(50.0)
+
+
+def test_seconds_timestamps_are_rejected():
+    """Float (seconds) clocks and timestamps raise instead of never sampling."""
+    with pytest.raises(TypeError, match="monotonic_ns_fn"):
+        ResourceMonitor(
+            psutil_module=_FakePsutil([[0.0, 0.0]]), monotonic_ns_fn=lambda: 0.0
+        )
+
+    monitor = ResourceMonitor(
+        psutil_module=_FakePsutil([[0.0, 0.0]]), monotonic_ns_fn=lambda: 0
+    )
+    with pytest.raises(TypeError, match="now_ns"):
+        monitor.maybe_sample(now_ns=0.6)
+    assert monitor.snapshot() is None
@@ -21,7 +21,7 @@ def test_ring_init():
     assert r.capacity == 10
     assert r.drop_oldest is True
     assert r.drops == 0
-    assert len(r.q) == 0
+    assert len(r) == 0
 
     r = Ring(capacity=5, drop_oldest=False)
     assert r.capacity == 5
@@ -33,7 +33,7 @@ def test_ring_push_not_full():
     r = Ring(capacity=3)
     assert r.push(1) is True
     assert r.push(2) is True
-    assert list(r.q) == [1, 2]
+    assert r.snapshot() == [1, 2]
     assert r.drops == 0
 
 
@@ -50,9 +50,32 @@ def test_ring_drain_partially_full():
     r.push(2)
     r.push(3)
     assert r.drain_upto(2) == [1, 2]
-    assert list(r.q) == [3]
+    assert r.snapshot() == [3]
     assert r.drain_upto(5) == [3]
-    assert list(r.q) == []
+    assert r.snapshot() == []
+
+
+def test_ring_drain_wraps_around():
+    """Test draining a span that wraps past the end of the backing storage."""
+    r = Ring(capacity=4)
+    for i in range(4):
+        r.push(i)
+    assert r.drain_upto(3) == [0, 1, 2]
+    r.push(4)
+    r.push(5)
+    assert r.snapshot() == [3, 4, 5]
+    assert r.drain_upto(10) == [3, 4, 5]
+    assert len(r) == 0
+    # A full drain resets the indices; the ring keeps working afterwards.
+    for i in range(6, 10):
+        r.push(i)
+    assert r.drain_upto(4) == [6, 7, 8, 9]
+
+
+def test_ring_rejects_nonpositive_capacity():
+    """Test that a ring cannot be created without room for an item."""
+    with pytest.raises(ValueError, match="capacity"):
+        Ring(capacity=0)
 
 
 def test_ring_overwrite_oldest():
@@ -61,17 +84,17 @@ def test_ring_overwrite_oldest():
     r.push(1)
     r.push(2)
     r.push(3)
-    assert list(r.q) == [1, 2, 3]
+    assert r.snapshot() == [1, 2, 3]
     assert r.drops == 0
 
     # This push should overwrite the oldest item (1)
     assert r.push(4) is True
-    assert list(r.q) == [2, 3, 4]
+    assert r.snapshot() == [2, 3, 4]
     assert r.drops == 1
 
     # This push should overwrite the oldest item (2)
     assert r.push(5) is True
-    assert list(r.q) == [3, 4, 5]
+    assert r.snapshot() == [3, 4, 5]
     assert r.drops == 2
 
     items = r.drain_upto(10)
@@ -85,17 +108,17 @@ def test_ring_reject_newest():
     r.push(1)
     r.push(2)
     r.push(3)
-    assert list(r.q) == [1, 2, 3]
+    assert r.snapshot() == [1, 2, 3]
     assert r.drops == 0
 
     # This push should be rejected
     assert r.push(4) is False
-    assert list(r.q) == [1, 2, 3]
+    assert r.snapshot() == [1, 2, 3]
     assert r.drops == 1
 
     # This push should also be rejected
     assert r.push(5) is False
-    assert list(r.q) == [1, 2, 3]
+    assert r.snapshot() == [1, 2, 3]
     assert r.drops == 2
 
     items = r.drain_upto(10)
@@ -138,11 +161,39 @@ def test_ring_thread_safety():
     assert not producer_thread.is_alive(), "Producer thread timed out"
     assert not consumer_thread.is_alive(), "Consumer thread timed out"
 
-    assert len(r.q) == 0
+    assert len(r) == 0
     assert len(consumed_items) == num_items
     assert sorted(consumed_items) == list(range(num_items))
 
 
+def test_blocking_ring_drain_waits_for_push():
+    """A blocking ring's consumer sleeps until pushes arrive instead of polling."""
+    num_items = 2000
+    r = Ring(capacity=num_items, blocking=True)
+    consumed_items = []
+
+    def consumer_loop():
+        while len(consumed_items) < num_items:
+            consumed_items.extend(r.drain_upto(10, timeout=5))
+
+    consumer_thread = threading.Thread(target=consumer_loop)
+    consumer_thread.start()
+    for i in range(num_items):
+        r.push(i)
+    consumer_thread.join(timeout=5)
+
+    assert not consumer_thread.is_alive(), "Consumer thread timed out"
+    assert consumed_items == list(range(num_items))
+
+
+def test_blocking_ring_drain_times_out_when_empty():
+    """drain_upto returns an empty list once the timeout expires."""
+    r = Ring(capacity=4, blocking=True)
+    assert r.drain_upto(10, timeout=0.01) == []
+    r.push(1)
+    assert r.drain_upto(10, timeout=0) == [1]
+
+
 @pytest.mark.parametrize("drop_oldest, push_result", [(True, True), (False, False)])
 def test_drops_counter(drop_oldest, push_result):
     """Test that the drops counter is incremented correctly."""